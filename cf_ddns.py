@@ -15,6 +15,9 @@ import os
 import re
 from typing import List, Dict, Any, Tuple
 
+# 预编译IPv4校验正则，避免每次验证时重新查找编译缓存
+_IPV4_RE = re.compile(r'^(\d{1,3}\.){3}\d{1,3}$')
+
 # 配置日志
 logging.basicConfig(
     level=logging.INFO,
@@ -668,10 +671,9 @@ class CloudflareDDNSManager:
         Returns:
             bool: 是否为有效IP格式
         """
-        ip_pattern = r'^(\d{1,3}\.){3}\d{1,3}$'
-        if not re.match(ip_pattern, ip):
+        if not _IPV4_RE.match(ip):
             return False
-        
+
         # 验证每个部分在0-255之间
         parts = ip.split('.')
         for part in parts:
@@ -11,48 +11,91 @@ import requests
 import json
 import os
 import sys
-import re
-from typing import List, Dict, Any, Optional
+import time
+import asyncio
+import aiohttp
+import hashlib
+import ipaddress
+import socket
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import List, Dict, Any, Iterable, Optional, Tuple
+from urllib3.util.retry import Retry
+
+try:
+    import orjson  # C实现的JSON解析器，大区域响应解码快3-10倍
+except ImportError:
+    orjson = None
+
+# 进程内DNS解析缓存：一次运行会向 api.cloudflare.com 发几十个请求，
+# 系统解析器不缓存时每个新连接都要付一次DNS往返。带TTL限界缓存
+# getaddrinfo 结果（aiohttp路径由 TCPConnector 的 ttl_dns_cache 覆盖）。
+_GETADDRINFO_TTL = 300  # 秒，避免长时间掩盖Cloudflare的DNS变更
+_GETADDRINFO_MAX_ENTRIES = 64
+_getaddrinfo_cache = {}
+_orig_getaddrinfo = socket.getaddrinfo
+
+def _cached_getaddrinfo(host, *args, **kwargs):
+    """带TTL的getaddrinfo缓存包装"""
+    key = (host, args, tuple(sorted(kwargs.items())))
+    now = time.time()
+    hit = _getaddrinfo_cache.get(key)
+    if hit is not None and now - hit[0] < _GETADDRINFO_TTL:
+        return hit[1]
+    result = _orig_getaddrinfo(host, *args, **kwargs)
+    if len(_getaddrinfo_cache) >= _GETADDRINFO_MAX_ENTRIES:
+        _getaddrinfo_cache.clear()
+    _getaddrinfo_cache[key] = (now, result)
+    return result
+
+socket.getaddrinfo = _cached_getaddrinfo
 
 class ConfigManager:
     """配置管理器，支持环境变量和配置文件"""
     
     def __init__(self):
         self.config_file = ".cloudflare_dnsm_config"
-        
+        self._file_config_cache = None
+
     def load_config(self) -> Dict[str, str]:
         """
         加载配置，优先级：环境变量 > 配置文件
-        
+
         Returns:
             配置字典
         """
         config = {}
-        
+
         # 从环境变量读取
         config['AUTH_EMAIL'] = os.getenv('CLOUDFLARE_AUTH_EMAIL', '')
         config['AUTH_KEY'] = os.getenv('CLOUDFLARE_AUTH_KEY', '')  # 全局API密钥
-        
-        # 如果环境变量没有完整配置，检查配置文件
-        if not all([config['AUTH_EMAIL'], config['AUTH_KEY']]):
-            file_config = self._load_config_file()
-            if file_config:
-                for key in ['AUTH_EMAIL', 'AUTH_KEY']:
-                    if not config.get(key) and file_config.get(key):
-                        config[key] = file_config[key]
-        
+
+        # 环境变量已完整时直接返回，跳过配置文件的磁盘读取
+        if config['AUTH_EMAIL'] and config['AUTH_KEY']:
+            return config
+
+        file_config = self._load_config_file()
+        if file_config:
+            for key in ['AUTH_EMAIL', 'AUTH_KEY']:
+                if not config.get(key) and file_config.get(key):
+                    config[key] = file_config[key]
+
         return config
-    
+
     def _load_config_file(self) -> Dict[str, str]:
         """
-        从配置文件读取配置
-        
+        从配置文件读取配置（结果缓存，同一次运行不重复读盘）
+
         Returns:
             配置字典，如果文件不存在返回空字典
         """
+        if self._file_config_cache is not None:
+            return self._file_config_cache
+
         if not os.path.exists(self.config_file):
+            self._file_config_cache = {}
             return {}
-            
+
         try:
             with open(self.config_file, 'r', encoding='utf-8') as f:
                 config = {}
@@ -61,6 +104,7 @@ class ConfigManager:
                     if line and not line.startswith('#') and '=' in line:
                         key, value = line.split('=', 1)
                         config[key.strip()] = value.strip()
+                self._file_config_cache = config
                 return config
         except Exception as e:
             print(f"❌ 读取配置文件失败: {e}")
@@ -75,6 +119,7 @@ class ConfigManager:
                 for key, value in config.items():
                     if value:  # 只保存非空值
                         f.write(f"{key}={value}\n")
+            self._file_config_cache = None  # 配置已变化，失效读取缓存
             self.print_status(f"配置已保存到 {self.config_file}", "success")
         except Exception as e:
             self.print_status(f"保存配置失败: {e}", "error")
@@ -109,16 +154,97 @@ class DNSManager:
             "X-Auth-Key": auth_key,
             "Content-Type": "application/json"
         }
-        
-        # 缓存域名列表
+
+        # 复用连接池的会话，避免每次请求重新建立TCP+TLS连接
+        # 瞬时 5xx/429 自动按指数退避重试，避免偶发故障中断整个操作。
+        # 只对幂等方法重试：POST创建可能在服务端已生效后才返回5xx，
+        # 自动重发会产生重复的DNS记录
+        self.session = requests.Session()
+        self.session.headers.update(self.headers)
+        retry = Retry(
+            total=5,
+            backoff_factor=0.6,
+            status_forcelist=(429, 500, 502, 503, 504),
+            allowed_methods=frozenset(['GET', 'DELETE']),
+            respect_retry_after_header=True
+        )
+        adapter = requests.adapters.HTTPAdapter(pool_connections=20, pool_maxsize=20, max_retries=retry)
+        self.session.mount('https://', adapter)
+
+        # 缓存域名列表（内存缓存 + 按账户区分的磁盘缓存）
         self._zones_cache = None
-        
+        email_digest = hashlib.md5(auth_email.encode('utf-8')).hexdigest()[:12]
+        self._zones_cache_file = f".cloudflare_dnsm_zones_{email_digest}.json"
+        self._zones_cache_ttl = 600  # 磁盘缓存有效期（秒）
+
+        # DNS记录查询的进程内TTL缓存：key为(zone_id, domain, params)，
+        # 同一会话内重复查询直接命中内存，写操作后按zone失效
+        self._records_cache = {}
+        self._records_cache_ttl = 60  # 秒
+        
+    @staticmethod
+    def _json(response) -> Dict[str, Any]:
+        """解析HTTP响应的JSON内容，优先使用orjson加速"""
+        if orjson is not None:
+            return orjson.loads(response.content)
+        return response.json()
+
+    @staticmethod
+    def _dumps(data) -> bytes:
+        """序列化JSON请求体，优先使用orjson"""
+        if orjson is not None:
+            return orjson.dumps(data)
+        return json.dumps(data).encode('utf-8')
+
+    @staticmethod
+    def _cf_err(result: Dict[str, Any]) -> str:
+        """从API响应中提取首条错误消息"""
+        errs = result.get('errors') or [{}]
+        return errs[0].get('message', '未知错误')
+
+    def _cf_call(self, method: str, url: str, **kwargs) -> Tuple[bool, Any]:
+        """
+        统一执行Cloudflare API请求并集中处理各类错误
+
+        Args:
+            method: HTTP方法（GET/POST/DELETE）
+            url: 请求URL
+            **kwargs: 透传给session.request的参数（params、data等）
+
+        Returns:
+            Tuple[bool, Any]: (是否成功, 成功时为API结果字典，失败时为错误描述字符串)
+        """
+        try:
+            kwargs.setdefault('timeout', 30)
+            response = self.session.request(method, url, **kwargs)
+            response.raise_for_status()
+
+            result = self._json(response)
+
+            if result.get("success", False):
+                return True, result
+
+            return False, self._cf_err(result)
+
+        except requests.exceptions.RequestException as e:
+            if hasattr(e, 'response') and e.response is not None:
+                try:
+                    error_detail = e.response.json()
+                    if error_detail.get('errors'):
+                        return False, f"{e.response.status_code} - {self._cf_err(error_detail)}"
+                    return False, f"{e.response.status_code} - {e.response.text}"
+                except Exception:
+                    return False, f"{e.response.status_code} - {e.response.text}"
+            return False, f"网络错误: {str(e)}"
+        except Exception as e:
+            return False, f"未知错误: {str(e)}"
+
     def print_banner(self, title: str):
         """打印美观的标题横幅"""
         print("\n" + "=" * 60)
         print(f"✨ {title}")
         print("=" * 60)
-        
+
     def print_section(self, title: str):
         """打印章节标题"""
         print(f"\n🎯 {title}")
@@ -143,56 +269,68 @@ class DNSManager:
             bool: 认证是否成功
         """
         self.print_section("测试API认证")
-        
+
+        self.print_status("使用全局API密钥认证...")
+        # 测试获取用户信息
+        ok, result = self._cf_call('GET', f"{self.base_url}/user")
+
+        if ok:
+            user_email = result.get('result', {}).get('email', '未知')
+            self.print_status(f"全局API密钥认证成功，用户: {user_email}", "success")
+            return True
+
+        self.print_status(f"认证失败: {result}", "error")
+        return False
+    
+    def _load_zones_disk_cache(self) -> Optional[List[Dict[str, Any]]]:
+        """
+        读取磁盘上的域名列表缓存，过期或不存在返回None
+
+        Returns:
+            域名列表或None
+        """
         try:
-            self.print_status("使用全局API密钥认证...")
-            # 测试获取用户信息
-            url = f"{self.base_url}/user"
-            
-            response = requests.get(url, headers=self.headers, timeout=30)
-            response.raise_for_status()
-            
-            result = response.json()
-            
-            if result.get("success", False):
-                user_email = result.get('result', {}).get('email', '未知')
-                self.print_status(f"全局API密钥认证成功，用户: {user_email}", "success")
-                return True
-            else:
-                errors = result.get('errors', [{'message': '未知错误'}])
-                error_msg = errors[0].get('message', '未知错误') if errors else '未知错误'
-                self.print_status(f"认证失败: {error_msg}", "error")
-                return False
-                
-        except requests.exceptions.RequestException as e:
-            if hasattr(e, 'response') and e.response is not None:
-                try:
-                    error_detail = e.response.json()
-                    errors = error_detail.get('errors', [])
-                    if errors:
-                        error_msg = errors[0].get('message', '未知错误')
-                        self.print_status(f"API请求失败: {e.response.status_code} - {error_msg}", "error")
-                    else:
-                        self.print_status(f"API请求失败: {e.response.status_code} - {e.response.text}", "error")
-                except:
-                    self.print_status(f"API请求失败: {e.response.status_code} - {e.response.text}", "error")
-            else:
-                self.print_status(f"网络错误: {str(e)}", "error")
-            return False
+            if not os.path.exists(self._zones_cache_file):
+                return None
+            if time.time() - os.path.getmtime(self._zones_cache_file) > self._zones_cache_ttl:
+                return None
+            with open(self._zones_cache_file, 'rb') as f:
+                if orjson is not None:
+                    return orjson.loads(f.read())
+                return json.load(f)
+        except Exception:
+            # 缓存损坏则忽略，走网络重新获取
+            return None
+
+    def _save_zones_disk_cache(self, zones: List[Dict[str, Any]]):
+        """保存域名列表到磁盘缓存"""
+        try:
+            with open(self._zones_cache_file, 'wb') as f:
+                f.write(self._dumps(zones))
         except Exception as e:
-            self.print_status(f"未知错误: {str(e)}", "error")
-            return False
-    
-    def get_all_zones(self) -> List[Dict[str, Any]]:
+            self.print_status(f"写入域名缓存失败: {e}", "warning")
+
+    def get_all_zones(self, refresh: bool = False) -> List[Dict[str, Any]]:
         """
         获取账户下的所有域名（Zones）
-        
+
+        Args:
+            refresh: 为True时跳过缓存强制重新获取
+
         Returns:
             域名列表
         """
-        if self._zones_cache:
-            return self._zones_cache
-            
+        if not refresh:
+            if self._zones_cache:
+                return self._zones_cache
+
+            # 磁盘缓存让重复运行跳过分页的 /zones 请求
+            cached_zones = self._load_zones_disk_cache()
+            if cached_zones:
+                self._zones_cache = cached_zones
+                self.print_status(f"使用缓存的域名列表（{len(cached_zones)} 个域名）", "info")
+                return cached_zones
+
         self.print_section("获取域名列表")
         
         # 先测试认证
@@ -200,55 +338,47 @@ class DNSManager:
             self.print_status("认证失败，无法获取域名列表", "error")
             return []
         
-        try:
-            url = f"{self.base_url}/zones"
-            params = {"per_page": 100, "page": 1}  # 每页最多100个域名
-            
-            all_zones = []
-            while True:
-                response = requests.get(url, headers=self.headers, params=params, timeout=30)
-                response.raise_for_status()
-                
-                result = response.json()
-                
-                if not result.get("success", False):
-                    error_msg = result.get('errors', [{'message': '未知错误'}])[0].get('message', '未知错误')
-                    self.print_status(f"获取域名列表失败: {error_msg}", "error")
-                    break
-                    
-                zones = result.get("result", [])
-                all_zones.extend(zones)
-                
-                # 检查是否有更多页面
-                result_info = result.get('result_info', {})
-                if result_info.get('page', 0) >= result_info.get('total_pages', 1):
-                    break
-                    
-                params['page'] += 1
-            
-            self._zones_cache = all_zones
-            self.print_status(f"找到 {len(all_zones)} 个域名", "success")
-            return all_zones
-            
-        except requests.exceptions.RequestException as e:
-            if hasattr(e, 'response') and e.response is not None:
-                try:
-                    error_detail = e.response.json()
-                    errors = error_detail.get('errors', [])
-                    if errors:
-                        error_msg = errors[0].get('message', '未知错误')
-                        self.print_status(f"获取域名列表失败: {e.response.status_code} - {error_msg}", "error")
-                    else:
-                        self.print_status(f"获取域名列表失败: {e.response.status_code} - {e.response.text}", "error")
-                except:
-                    self.print_status(f"获取域名列表失败: {e.response.status_code} - {e.response.text}", "error")
-            else:
-                self.print_status(f"网络错误: {str(e)}", "error")
-            return []
-        except Exception as e:
-            self.print_status(f"未知错误: {str(e)}", "error")
+        url = f"{self.base_url}/zones"
+
+        # 先取第1页，拿到 total_pages 后并发抓取剩余页面
+        ok, result = self._cf_call('GET', url, params={"per_page": 100, "page": 1})
+
+        if not ok:
+            self.print_status(f"获取域名列表失败: {result}", "error")
             return []
-    
+
+        all_zones = list(result.get("result", []))
+        total_pages = result.get('result_info', {}).get('total_pages', 1)
+
+        pages_failed = False
+
+        if total_pages > 1:
+            def fetch_page(page: int) -> Optional[List[Dict[str, Any]]]:
+                page_ok, page_result = self._cf_call('GET', url, params={"per_page": 100, "page": page})
+                if not page_ok:
+                    self.print_status(f"获取域名列表第 {page} 页失败: {page_result}", "error")
+                    return None
+                return page_result.get("result", [])
+
+            with ThreadPoolExecutor(max_workers=min(8, total_pages - 1)) as executor:
+                for zones in executor.map(fetch_page, range(2, total_pages + 1)):
+                    if zones is None:
+                        pages_failed = True
+                    else:
+                        all_zones.extend(zones)
+
+        if pages_failed:
+            # 列表不完整时不写入内存/磁盘缓存，避免后续运行在缓存
+            # 有效期内一直基于残缺的账户视图操作
+            self.print_status(f"部分页面获取失败，本次仅使用 {len(all_zones)} 个域名（不缓存）", "warning")
+            return all_zones
+
+        self._zones_cache = all_zones
+        if all_zones:
+            self._save_zones_disk_cache(all_zones)
+        self.print_status(f"找到 {len(all_zones)} 个域名", "success")
+        return all_zones
+
     def select_zone_interactive(self) -> Optional[Dict[str, Any]]:
         """
         交互式选择域名
@@ -261,25 +391,23 @@ class DNSManager:
             self.print_status("没有找到任何域名", "error")
             return None
         
-        print("\n📋 可用域名列表:")
-        print("-" * 80)
-        print(f"{'序号':<4} {'域名':<30} {'状态':<10} {'ID':<30}")
-        print("-" * 80)
-        
+        lines = [
+            "\n📋 可用域名列表:",
+            "-" * 80,
+            f"{'序号':<4} {'域名':<30} {'状态':<10} {'ID':<30}",
+            "-" * 80,
+        ]
+
         for i, zone in enumerate(zones, 1):
-            zone_name = zone.get('name', 'N/A')
-            zone_status = zone.get('status', 'N/A')
-            zone_id = zone.get('id', 'N/A')
-            
             # 截断过长的内容以便显示
-            if len(zone_name) > 28:
-                zone_name = zone_name[:25] + "..."
-            if len(zone_id) > 27:
-                zone_id = zone_id[:24] + "..."
-            
-            print(f"{i:<4} {zone_name:<30} {zone_status:<10} {zone_id:<30}")
-        
-        print("-" * 80)
+            zone_name = self._trunc(zone.get('name', 'N/A'), 28)
+            zone_status = zone.get('status', 'N/A')
+            zone_id = self._trunc(zone.get('id', 'N/A'), 27)
+
+            lines.append(f"{i:<4} {zone_name:<30} {zone_status:<10} {zone_id:<30}")
+
+        lines.append("-" * 80)
+        sys.stdout.write('\n'.join(lines) + '\n')
         
         while True:
             try:
@@ -297,108 +425,195 @@ class DNSManager:
             except ValueError:
                 self.print_status("请输入有效的数字", "warning")
     
-    def get_dns_records(self, zone_id: str, domain: str = None) -> List[Dict[str, Any]]:
+    def iter_dns_records(self, zone_id: str, domain: str = None, params: Dict[str, str] = None,
+                         state: Dict[str, bool] = None):
         """
-        获取指定域名的DNS记录
-        
+        按页惰性遍历指定区域的DNS记录（生成器）
+
+        逐页请求并逐条yield，常驻内存只有一页记录，调用方可提前终止。
+
         Args:
             zone_id: 域名区域ID
             domain: 具体域名（可选）
-            
+            params: 附加的服务端过滤参数（可选，如 {'name.contains': ..., 'content': ...}）
+            state: 可选的状态字典；分页中途失败时置 state['failed'] = True，
+                   调用方据此区分"取完了"和"被截断"
+
+        Yields:
+            单条DNS记录（已附加zone_id）
+        """
+        url = f"{self.base_url}/zones/{zone_id}/dns_records"
+        query = dict(params) if params else {}
+        if domain:
+            query["name"] = domain
+        query.setdefault("per_page", 5000)  # Cloudflare允许的最大值，列表阶段往返次数降至1/50
+        query["page"] = 1
+
+        while True:
+            ok, result = self._cf_call('GET', url, params=query)
+
+            if not ok:
+                self.print_status(f"获取DNS记录失败: {result}", "error")
+                if state is not None:
+                    state['failed'] = True
+                return
+
+            for record in result.get("result", []):
+                # 为每条记录添加zone_id信息
+                record['zone_id'] = zone_id
+                yield record
+
+            # 检查是否还有更多页面
+            result_info = result.get('result_info', {})
+            if result_info.get('page', 0) >= result_info.get('total_pages', 1):
+                return
+
+            query["page"] += 1
+
+    def get_dns_records(self, zone_id: str, domain: str = None, params: Dict[str, str] = None) -> List[Dict[str, Any]]:
+        """
+        获取指定域名的DNS记录（iter_dns_records的列表包装）
+
+        Args:
+            zone_id: 域名区域ID
+            domain: 具体域名（可选）
+            params: 附加的服务端过滤参数（可选，如 {'name.contains': ..., 'content': ...}）
+
         Returns:
             DNS记录列表
         """
         self.print_section("获取DNS记录")
-        
-        try:
-            url = f"{self.base_url}/zones/{zone_id}/dns_records"
-            params = {}
-            if domain:
-                params["name"] = domain
-                self.print_status(f"正在查询域名 {domain} 的DNS记录...")
+
+        cache_key = (zone_id, domain, tuple(sorted(params.items())) if params else None)
+        hit = self._records_cache.get(cache_key)
+        if hit is not None and time.time() - hit[0] < self._records_cache_ttl:
+            self.print_status(f"使用缓存的DNS记录（{len(hit[1])} 条）")
+            return list(hit[1])
+
+        iter_state = {'failed': False}
+        if domain:
+            self.print_status(f"正在查询域名 {domain} 的DNS记录...")
+            # 过滤指定域名的记录
+            records = [record for record in self.iter_dns_records(zone_id, domain, params, state=iter_state)
+                       if record.get('name') == domain]
+            self.print_status(f"找到 {len(records)} 条域名 {domain} 的DNS记录", "success")
+        else:
+            if params:
+                self.print_status(f"正在按条件 {params} 查询DNS记录...")
             else:
                 self.print_status("正在查询所有DNS记录...")
-            
-            response = requests.get(url, headers=self.headers, params=params, timeout=30)
-            response.raise_for_status()
-            
-            result = response.json()
-            
-            if not result.get("success", False):
-                error_msg = result.get('errors', [{'message': '未知错误'}])[0].get('message', '未知错误')
-                self.print_status(f"获取DNS记录失败: {error_msg}", "error")
-                return []
-                
-            records = result.get("result", [])
-            
-            # 为每条记录添加zone_id信息
-            for record in records:
-                record['zone_id'] = zone_id
-            
-            if domain:
-                # 过滤指定域名的记录
-                filtered_records = [record for record in records if record.get('name') == domain]
-                self.print_status(f"找到 {len(filtered_records)} 条域名 {domain} 的DNS记录", "success")
-                return filtered_records
-            else:
-                self.print_status(f"找到 {len(records)} 条DNS记录", "success")
-                return records
-            
-        except requests.exceptions.RequestException as e:
-            if hasattr(e, 'response') and e.response is not None:
-                try:
-                    error_detail = e.response.json()
-                    errors = error_detail.get('errors', [])
-                    if errors:
-                        error_msg = errors[0].get('message', '未知错误')
-                        self.print_status(f"获取DNS记录失败: {e.response.status_code} - {error_msg}", "error")
-                    else:
-                        self.print_status(f"获取DNS记录失败: {e.response.status_code} - {e.response.text}", "error")
-                except:
-                    self.print_status(f"获取DNS记录失败: {e.response.status_code} - {e.response.text}", "error")
-            else:
-                self.print_status(f"网络错误: {str(e)}", "error")
-            return []
-        except Exception as e:
-            self.print_status(f"未知错误: {str(e)}", "error")
-            return []
+            records = list(self.iter_dns_records(zone_id, params=params, state=iter_state))
+            self.print_status(f"找到 {len(records)} 条DNS记录", "success")
+
+        # 分页中途失败说明列表被截断，不写缓存，避免60秒内反复命中
+        # 残缺结果（与域名列表缓存的处理一致）
+        if iter_state['failed']:
+            self.print_status("分页未完成，本次结果可能不完整（不缓存）", "warning")
+        else:
+            self._records_cache[cache_key] = (time.time(), records)
+        return records
+
+    def _invalidate_records_cache(self, zone_id: str):
+        """写操作后失效指定区域的记录查询缓存，避免返回过期数据"""
+        for key in [k for k in self._records_cache if k[0] == zone_id]:
+            del self._records_cache[key]
     
-    def get_all_dns_records_across_zones(self, target_domain: str = None) -> List[Dict[str, Any]]:
+    async def _fetch_zone_records(self, session, zone: Dict[str, Any], sem: asyncio.Semaphore, target_domain: str = None, extra_params: Dict[str, str] = None):
         """
-        获取所有域名下的DNS记录（跨域名查询）
-        
+        异步获取单个域名区域的DNS记录（内部辅助方法）
+
         Args:
+            session: aiohttp会话
+            zone: 域名区域信息
+            sem: 并发限制信号量
             target_domain: 目标域名（可选）
-            
+            extra_params: 附加的服务端过滤参数（可选，如 content、type）
+
+        Returns:
+            (zone, API响应结果) 元组
+        """
+        url = f"{self.base_url}/zones/{zone.get('id')}/dns_records"
+        params = dict(extra_params) if extra_params else {}
+        if target_domain:
+            params["name"] = target_domain
+        params.setdefault("per_page", 5000)  # 与iter_dns_records一致，单次拉满
+        async with sem:
+            # 命中速率限制(429)时按指数退避重试，优先遵循 Retry-After 头
+            for attempt in range(4):
+                async with session.get(url, params=params, headers=self.headers) as response:
+                    if response.status == 429 and attempt < 3:
+                        retry_after = response.headers.get('Retry-After')
+                        delay = float(retry_after) if retry_after else 0.5 * (2 ** attempt)
+                        await asyncio.sleep(delay)
+                        continue
+                    return zone, await response.json()
+
+    async def _gather_all_zone_records(self, zones: List[Dict[str, Any]], target_domain: str = None, extra_params: Dict[str, str] = None):
+        """
+        并发抓取所有域名区域的DNS记录
+
+        Args:
+            zones: 域名区域列表
+            target_domain: 目标域名（可选）
+            extra_params: 附加的服务端过滤参数（可选）
+
+        Returns:
+            每个区域的 (zone, 结果) 列表，失败的区域为异常对象
+        """
+        # 信号量限制并发数，避免触发API速率限制
+        sem = asyncio.Semaphore(8)
+        connector = aiohttp.TCPConnector(limit=20, ttl_dns_cache=300)
+        async with aiohttp.ClientSession(connector=connector) as session:
+            tasks = [self._fetch_zone_records(session, zone, sem, target_domain, extra_params) for zone in zones]
+            return await asyncio.gather(*tasks, return_exceptions=True)
+
+    def get_all_dns_records_across_zones(self, target_domain: str = None, extra_params: Dict[str, str] = None) -> List[Dict[str, Any]]:
+        """
+        获取所有域名下的DNS记录（跨域名并发查询）
+
+        Args:
+            target_domain: 目标域名（可选）
+            extra_params: 附加的服务端过滤参数（可选，如 {'content': ip}）
+
         Returns:
             DNS记录列表，包含域名信息
         """
         self.print_section("跨域名查询DNS记录")
-        
+
         zones = self.get_all_zones()
         if not zones:
             return []
-        
+
+        self.print_status(f"正在并发查询 {len(zones)} 个域名的DNS记录...")
+
         all_records = []
-        
-        for zone in zones:
+        results = asyncio.run(self._gather_all_zone_records(zones, target_domain, extra_params))
+
+        for zone, item in zip(zones, results):
             zone_name = zone.get('name', 'Unknown')
             zone_id = zone.get('id')
-            
-            self.print_status(f"正在查询域名 {zone_name}...")
-            records = self.get_dns_records(zone_id, target_domain)
-            
+
+            if isinstance(item, Exception):
+                self.print_status(f"查询域名 {zone_name} 失败: {item}", "error")
+                continue
+
+            _, result = item
+            if not result.get("success", False):
+                error_msg = self._cf_err(result)
+                self.print_status(f"查询域名 {zone_name} 失败: {error_msg}", "error")
+                continue
+
+            records = result.get("result", [])
+            if target_domain:
+                records = [record for record in records if record.get('name') == target_domain]
+
             # 为每条记录添加域名信息
             for record in records:
                 record['zone_name'] = zone_name
                 record['zone_id'] = zone_id
-            
+
             all_records.extend(records)
-            
-            # 短暂延迟避免API限制
-            import time
-            time.sleep(0.2)
-        
+
         if target_domain:
             self.print_status(f"在所有域名中找到 {len(all_records)} 条关于 {target_domain} 的DNS记录", "success")
         else:
@@ -406,43 +621,60 @@ class DNSManager:
         
         return all_records
     
-    def display_records_table(self, records: List[Dict[str, Any]]):
+    @staticmethod
+    def _trunc(text: str, limit: int) -> str:
+        """超过limit的字符串截断为前limit-3个字符加省略号"""
+        if len(text) > limit:
+            return text[:limit - 3] + "..."
+        return text
+
+    def display_records_table(self, records: Iterable[Dict[str, Any]]):
         """
         以表格形式显示DNS记录
-        
+
+        接受列表或生成器（如 iter_dns_records）：按批拼好后分段写出，
+        生成器输入时首页记录一到就能看到输出，不必等全部分页拉完；
+        同时避免大记录集下逐行print的格式化和刷新开销。
+
         Args:
-            records: DNS记录列表
+            records: DNS记录列表或可迭代对象
         """
-        if not records:
-            self.print_status("没有找到DNS记录", "warning")
-            return
-        
-        print("\n📋 DNS记录列表:")
-        print("-" * 130)
-        print(f"{'序号':<4} {'域名':<20} {'类型':<6} {'名称':<25} {'内容':<20} {'TTL':<6} {'ID':<20}")
-        print("-" * 130)
-        
+        lines = []
+        count = 0
+
         for i, record in enumerate(records, 1):
-            zone_name = record.get('zone_name', 'N/A')
+            if i == 1:
+                # 首条记录到达时立即输出表头
+                sys.stdout.write('\n'.join([
+                    "\n📋 DNS记录列表:",
+                    "-" * 130,
+                    f"{'序号':<4} {'域名':<20} {'类型':<6} {'名称':<25} {'内容':<20} {'TTL':<6} {'ID':<20}",
+                    "-" * 130,
+                ]) + '\n')
+
+            # 截断过长的内容以便显示
+            zone_name = self._trunc(record.get('zone_name', 'N/A'), 18)
             record_type = record.get('type', 'N/A')
-            record_name = record.get('name', 'N/A')
-            record_content = record.get('content', 'N/A')
+            record_name = self._trunc(record.get('name', 'N/A'), 23)
+            record_content = self._trunc(record.get('content', 'N/A'), 18)
             record_ttl = record.get('ttl', 'N/A')
-            record_id = record.get('id', 'N/A')
-            
-            # 截断过长的内容以便显示
-            if len(zone_name) > 18:
-                zone_name = zone_name[:15] + "..."
-            if len(record_name) > 23:
-                record_name = record_name[:20] + "..."
-            if len(record_content) > 18:
-                record_content = record_content[:15] + "..."
-            if len(record_id) > 17:
-                record_id = record_id[:14] + "..."
-            
-            print(f"{i:<4} {zone_name:<20} {record_type:<6} {record_name:<25} {record_content:<20} {record_ttl:<6} {record_id:<20}")
-        
-        print("-" * 130)
+            record_id = self._trunc(record.get('id', 'N/A'), 17)
+
+            lines.append(f"{i:<4} {zone_name:<20} {record_type:<6} {record_name:<25} {record_content:<20} {record_ttl:<6} {record_id:<20}")
+            count = i
+
+            # 每满一批就刷出去，流式输入下边拉边显示
+            if len(lines) >= 100:
+                sys.stdout.write('\n'.join(lines) + '\n')
+                sys.stdout.flush()
+                lines.clear()
+
+        if count == 0:
+            self.print_status("没有找到DNS记录", "warning")
+            return
+
+        lines.append("-" * 130)
+        sys.stdout.write('\n'.join(lines) + '\n')
     
     def search_dns_records_by_subdomain(self, zone_id: str, subdomain_pattern: str) -> List[Dict[str, Any]]:
         """
@@ -456,19 +688,18 @@ class DNSManager:
             匹配的DNS记录列表
         """
         self.print_section(f"搜索子域名包含 '{subdomain_pattern}' 的DNS记录")
-        
-        all_records = self.get_dns_records(zone_id)
-        if not all_records:
-            return []
-        
-        matching_records = []
-        for record in all_records:
-            record_name = record.get('name', '')
-            if subdomain_pattern in record_name:
-                # 确保记录包含zone_id信息
-                record['zone_id'] = zone_id
-                matching_records.append(record)
-        
+
+        if any(ch in subdomain_pattern for ch in '*?['):
+            # 通配符模式API不支持，回退为拉取整个区域后在本地用fnmatch过滤
+            import fnmatch
+            matching_records = [
+                record for record in self.iter_dns_records(zone_id)
+                if fnmatch.fnmatch(record.get('name', ''), f"*{subdomain_pattern}*")
+            ]
+        else:
+            # name.contains 让服务端直接过滤，避免拉取整个区域的记录
+            matching_records = self.get_dns_records(zone_id, params={'name.contains': subdomain_pattern})
+
         self.print_status(f"找到 {len(matching_records)} 条包含 '{subdomain_pattern}' 的DNS记录", "success")
         return matching_records
 
@@ -513,11 +744,7 @@ class DNSManager:
                 self.print_status(f"已删除记录: {record_name} -> {record_content}", "success")
             else:
                 self.print_status(f"删除记录失败: {record_name} -> {record_content}", "error")
-            
-            # 短暂延迟避免API限制
-            import time
-            time.sleep(0.5)
-        
+
         self.print_status(f"删除完成，共删除 {deleted_count} 条记录", "success")
         return deleted_count
     
@@ -534,25 +761,27 @@ class DNSManager:
             删除的记录数量
         """
         if zone_id:
-            # 在指定域名中删除
+            # 在指定域名中删除（content 参数让服务端只返回匹配IP的记录）
             self.print_section(f"删除IP为 {ip} 的DNS记录（指定域名）")
-            all_records = self.get_dns_records(zone_id, target_domain)
+            all_records = self.get_dns_records(zone_id, target_domain, params={'content': ip})
         else:
             # 在所有域名中删除
             self.print_section(f"删除IP为 {ip} 的DNS记录（所有域名）")
-            all_records = self.get_all_dns_records_across_zones(target_domain)
+            all_records = self.get_all_dns_records_across_zones(target_domain, extra_params={'content': ip})
         
         if not all_records:
             return 0
         
-        # 筛选匹配IP的记录
-        matching_records = []
+        # 先按 (类型, 内容) 建哈希索引，再O(1)取出匹配IP的A/AAAA记录，
+        # 同一会话内重复按IP筛选时可直接复用索引
+        records_index = defaultdict(list)
         for record in all_records:
-            if (record.get('type') in ['A', 'AAAA'] and 
-                record.get('content') == ip and
-                (target_domain is None or record.get('name') == target_domain)):
-                matching_records.append(record)
-        
+            records_index[(record.get('type'), record.get('content'))].append(record)
+
+        matching_records = records_index.get(('A', ip), []) + records_index.get(('AAAA', ip), [])
+        if target_domain is not None:
+            matching_records = [record for record in matching_records if record.get('name') == target_domain]
+
         if not matching_records:
             self.print_status(f"没有找到IP为 {ip} 的DNS记录", "warning")
             return 0
@@ -567,27 +796,63 @@ class DNSManager:
             self.print_status("取消删除操作", "info")
             return 0
         
-        # 执行删除
-        deleted_count = 0
+        # 按域名分桶后走batch端点，每个域名只发一次删除请求
+        records_by_zone = defaultdict(list)
         for record in matching_records:
-            record_zone_id = record.get('zone_id')
-            record_id = record.get('id')
-            record_name = record.get('name')
-            record_content = record.get('content')
-            
-            if self._delete_single_record(record_zone_id, record_id, record_content):
-                deleted_count += 1
-                self.print_status(f"已删除记录: {record_name} -> {record_content}", "success")
+            records_by_zone[record.get('zone_id') or zone_id].append(record)
+
+        deleted_count = 0
+        for record_zone_id, zone_records in records_by_zone.items():
+            ok, result = self.batch_dns_records(
+                record_zone_id,
+                deletes=[{'id': record.get('id')} for record in zone_records]
+            )
+            if ok:
+                deleted_count += len(zone_records)
+                for record in zone_records:
+                    self.print_status(f"已删除记录: {record.get('name')} -> {record.get('content')}", "success")
             else:
-                self.print_status(f"删除记录失败: {record_name} -> {record_content}", "error")
-            
-            # 短暂延迟避免API限制
-            import time
-            time.sleep(0.5)
-        
+                self.print_status(f"批量删除失败: {result}", "error")
+
         self.print_status(f"删除完成，共删除 {deleted_count} 条记录", "success")
         return deleted_count
-    
+
+    def _delete_records_parallel(self, records: List[Dict[str, Any]], max_workers: int = 8) -> int:
+        """
+        并发删除一批DNS记录
+
+        Args:
+            records: 要删除的DNS记录列表（需包含zone_id）
+            max_workers: 最大并发线程数
+
+        Returns:
+            删除的记录数量
+        """
+        deleted_count = 0
+        with ThreadPoolExecutor(max_workers=min(max_workers, len(records))) as executor:
+            future_to_record = {
+                executor.submit(
+                    self._delete_single_record,
+                    record.get('zone_id'), record.get('id'), record.get('content')
+                ): record
+                for record in records
+            }
+            for future in as_completed(future_to_record):
+                record = future_to_record[future]
+                record_name = record.get('name')
+                record_content = record.get('content')
+                try:
+                    success = future.result()
+                except Exception as e:
+                    self.print_status(f"删除记录 {record_name} -> {record_content} 时发生异常: {str(e)}", "error")
+                    continue
+                if success:
+                    deleted_count += 1
+                    self.print_status(f"已删除记录: {record_name} -> {record_content}", "success")
+                else:
+                    self.print_status(f"删除记录失败: {record_name} -> {record_content}", "error")
+        return deleted_count
+
     def delete_dns_records_by_subdomain(self, subdomain_pattern: str, ip: str = None) -> int:
         """
         根据子域名模式删除DNS记录
@@ -627,26 +892,11 @@ class DNSManager:
             return 0
         
         # 执行删除
-        deleted_count = 0
-        for record in matching_records:
-            zone_id = record.get('zone_id')
-            record_id = record.get('id')
-            record_name = record.get('name')
-            record_content = record.get('content')
-            
-            if self._delete_single_record(zone_id, record_id, record_content):
-                deleted_count += 1
-                self.print_status(f"已删除记录: {record_name} -> {record_content}", "success")
-            else:
-                self.print_status(f"删除记录失败: {record_name} -> {record_content}", "error")
-            
-            # 短暂延迟避免API限制
-            import time
-            time.sleep(0.5)
-        
+        deleted_count = self._delete_records_parallel(matching_records)
+
         self.print_status(f"删除完成，共删除 {deleted_count} 条记录", "success")
         return deleted_count
-    
+
     def _delete_single_record(self, zone_id: str, record_id: str, ip: str) -> bool:
         """
         删除单个DNS记录
@@ -659,40 +909,48 @@ class DNSManager:
         Returns:
             bool: 删除是否成功
         """
-        try:
-            url = f"{self.base_url}/zones/{zone_id}/dns_records/{record_id}"
-            
-            response = requests.delete(url, headers=self.headers, timeout=30)
-            response.raise_for_status()
-            
-            result = response.json()
-            
-            if result.get("success", False):
-                return True
-            else:
-                errors = result.get('errors', [{'message': '未知错误'}])
-                error_msg = errors[0].get('message', '未知错误') if errors else '未知错误'
-                self.print_status(f"删除DNS记录失败: {error_msg}", "error")
-                return False
-                
-        except requests.exceptions.RequestException as e:
-            if hasattr(e, 'response') and e.response is not None:
-                try:
-                    error_detail = e.response.json()
-                    errors = error_detail.get('errors', [])
-                    if errors:
-                        error_msg = errors[0].get('message', '未知错误')
-                        self.print_status(f"删除DNS记录失败: {e.response.status_code} - {error_msg}", "error")
-                    else:
-                        self.print_status(f"删除DNS记录失败: {e.response.status_code} - {e.response.text}", "error")
-                except:
-                    self.print_status(f"删除DNS记录失败: {e.response.status_code} - {e.response.text}", "error")
-            else:
-                self.print_status(f"删除DNS记录时发生网络错误: {str(e)}", "error")
-            return False
-        except Exception as e:
-            self.print_status(f"删除DNS记录时发生未知错误: {str(e)}", "error")
-            return False
+        ok, result = self._cf_call('DELETE', f"{self.base_url}/zones/{zone_id}/dns_records/{record_id}")
+
+        if ok:
+            self._invalidate_records_cache(zone_id)
+            return True
+
+        self.print_status(f"删除DNS记录失败: {result}", "error")
+        return False
+
+    def batch_dns_records(self, zone_id: str, deletes: List[Dict[str, Any]] = None,
+                          posts: List[Dict[str, Any]] = None,
+                          patches: List[Dict[str, Any]] = None) -> Tuple[bool, Any]:
+        """
+        通过 /dns_records/batch 端点在一次HTTP调用中批量变更DNS记录
+
+        相比逐条调用，N条记录的增删改只消耗1次往返和1次配额，
+        批量删除/添加路径从 O(记录数) 请求降为 O(域名数) 请求。
+
+        Args:
+            zone_id: 域名区域ID
+            deletes: 要删除的记录，每项形如 {'id': 记录ID}
+            posts: 要创建的记录，每项为完整记录参数字典
+            patches: 要部分更新的记录，每项需包含 'id' 及变更字段
+
+        Returns:
+            Tuple[bool, Any]: (是否成功, 成功时为API结果字典，失败时为错误描述字符串)
+        """
+        body = {}
+        if deletes:
+            body['deletes'] = deletes
+        if posts:
+            body['posts'] = posts
+        if patches:
+            body['patches'] = patches
+        if not body:
+            return True, {}
+
+        ok, result = self._cf_call('POST', f"{self.base_url}/zones/{zone_id}/dns_records/batch",
+                                   data=self._dumps(body))
+        if ok:
+            self._invalidate_records_cache(zone_id)
+        return ok, result
 
     def delete_selected_record(self, records: List[Dict[str, Any]]) -> bool:
         """
@@ -777,71 +1035,103 @@ class DNSManager:
             self.print_status(f"IPv6地址格式无效: {ip}", "error")
             return False
         
-        try:
-            url = f"{self.base_url}/zones/{zone_id}/dns_records"
-            
-            data = {
-                "type": record_type,
-                "name": domain,
-                "content": ip,
-                "ttl": ttl,
-                "proxied": proxied
-            }
-            
-            response = requests.post(url, headers=self.headers, data=json.dumps(data), timeout=30)
-            response.raise_for_status()
-            
-            result = response.json()
-            
-            if result.get("success", False):
-                record_id = result.get('result', {}).get('id', '未知')
-                self.print_status(f"成功创建DNS记录: {domain} -> {ip}", "success")
-                return True
-            else:
-                errors = result.get('errors', [{'message': '未知错误'}])
-                error_msg = errors[0].get('message', '未知错误') if errors else '未知错误'
-                self.print_status(f"创建DNS记录失败: {error_msg}", "error")
-                return False
-                
-        except requests.exceptions.RequestException as e:
-            if hasattr(e, 'response') and e.response is not None:
-                try:
-                    error_detail = e.response.json()
-                    errors = error_detail.get('errors', [])
-                    if errors:
-                        error_msg = errors[0].get('message', '未知错误')
-                        self.print_status(f"创建DNS记录失败: {e.response.status_code} - {error_msg}", "error")
-                    else:
-                        self.print_status(f"创建DNS记录失败: {e.response.status_code} - {e.response.text}", "error")
-                except:
-                    self.print_status(f"创建DNS记录失败: {e.response.status_code} - {e.response.text}", "error")
-            else:
-                self.print_status(f"创建DNS记录时发生网络错误: {str(e)}", "error")
-            return False
-        except Exception as e:
-            self.print_status(f"创建DNS记录时发生未知错误: {str(e)}", "error")
-            return False
+        data = {
+            "type": record_type,
+            "name": domain,
+            "content": ip,
+            "ttl": ttl,
+            "proxied": proxied
+        }
+
+        ok, result = self._cf_call('POST', f"{self.base_url}/zones/{zone_id}/dns_records", data=self._dumps(data))
+
+        if ok:
+            self._invalidate_records_cache(zone_id)
+            self.print_status(f"成功创建DNS记录: {domain} -> {ip}", "success")
+            return True
+
+        self.print_status(f"创建DNS记录失败: {result}", "error")
+        return False
     
+    def add_dns_records(self, zone_id: str, records: List[Dict[str, Any]]) -> List[bool]:
+        """
+        通过batch端点一次性批量添加DNS记录
+
+        Args:
+            zone_id: 域名区域ID
+            records: 记录参数字典列表，每项为 add_dns_record 的关键字参数
+                     （如 {'domain': ..., 'ip': ..., 'record_type': 'A'}）
+
+        Returns:
+            List[bool]: 与records顺序对应的每条添加结果
+        """
+        self.print_section(f"批量添加 {len(records)} 条DNS记录")
+
+        if not records:
+            return []
+
+        # 先统一校验所有IP，避免中途一条坏数据浪费前面已成功的创建
+        for record in records:
+            ip = record.get('ip', '')
+            record_type = record.get('record_type', 'A')
+            if record_type == "A" and not self._is_valid_ipv4(ip):
+                self.print_status(f"IPv4地址格式无效: {ip}，取消批量添加", "error")
+                return [False] * len(records)
+            if record_type == "AAAA" and not self._is_valid_ipv6(ip):
+                self.print_status(f"IPv6地址格式无效: {ip}，取消批量添加", "error")
+                return [False] * len(records)
+
+        posts = [
+            {
+                "type": record.get('record_type', 'A'),
+                "name": record['domain'],
+                "content": record['ip'],
+                "ttl": record.get('ttl', 1),
+                "proxied": record.get('proxied', False)
+            }
+            for record in records
+        ]
+
+        ok, result = self.batch_dns_records(zone_id, posts=posts)
+        if not ok:
+            # batch端点是原子提交，失败即整批丢弃，逐条列出让用户重录
+            self.print_status(f"批量添加失败: {result}", "error")
+            for record in records:
+                self.print_status(f"未添加: {record['domain']} -> {record['ip']}", "warning")
+            return [False] * len(records)
+
+        for record in records:
+            self.print_status(f"成功创建DNS记录: {record['domain']} -> {record['ip']}", "success")
+        self.print_status(f"批量添加完成，成功 {len(records)}/{len(records)} 条", "success")
+        return [True] * len(records)
+
     def _is_valid_ipv4(self, ip: str) -> bool:
         """验证IPv4地址格式"""
-        ip_pattern = r'^(\d{1,3}\.){3}\d{1,3}$'
-        if not re.match(ip_pattern, ip):
+        try:
+            ipaddress.IPv4Address(ip)
+            return True
+        except ValueError:
             return False
-        
-        parts = ip.split('.')
-        for part in parts:
-            if not part.isdigit() or not 0 <= int(part) <= 255:
-                return False
-        return True
-    
+
     def _is_valid_ipv6(self, ip: str) -> bool:
-        """简单验证IPv6地址格式"""
-        ipv6_pattern = r'^([0-9a-fA-F]{1,4}:){7}[0-9a-fA-F]{1,4}$|^::1$|^::$'
-        return bool(re.match(ipv6_pattern, ip))
+        """验证IPv6地址格式（支持压缩写法等完整RFC 4291格式）"""
+        try:
+            ipaddress.IPv6Address(ip)
+            return True
+        except ValueError:
+            return False
+
+# Windows上先执行一次空命令以启用终端的VT转义序列处理
+if os.name == 'nt':
+    os.system('')
+
+# 确认输入的肯定答案集合（常量，不必每次确认重建列表字面量）
+YES_INPUTS = frozenset({'y', 'yes'})
 
 def clear_screen():
-    """清空终端屏幕"""
-    os.system('cls' if os.name == 'nt' else 'clear')
+    """清空终端屏幕（直接写ANSI转义序列，免去每次fork一个cls/clear子进程）"""
+    sys.stdout.write('\x1b[H\x1b[2J\x1b[3J')
+    sys.stdout.flush()
 
 def print_menu():
     """打印主菜单"""
@@ -1059,9 +1349,15 @@ def main():
                 zone_id = zone_info.get('id')
                 zone_name = zone_info.get('name')
                 
-                # 初始化子域名变量
+                # 初始化子域名变量和待提交记录队列
                 current_subdomain = ""
-                
+                pending_records = []
+
+                # 记住上一条记录的参数，连续添加时回车直接复用
+                last_type = "A"
+                last_ttl = 1
+                last_proxied = False
+
                 while True:
                     clear_screen()
                     manager.print_banner(f"添加DNS记录 - 域名: {zone_name}")
@@ -1099,26 +1395,44 @@ def main():
                         input("\n按回车键继续...")
                         continue
                     
-                    # 选择记录类型
-                    record_type = input("请输入记录类型 (默认: A): ").strip().upper()
+                    # 选择记录类型（回车复用上一条的值）
+                    record_type = input(f"请输入记录类型 (默认: {last_type}): ").strip().upper()
                     if not record_type:
-                        record_type = "A"
-                    
-                    # 选择TTL
-                    ttl_input = input("请输入TTL值 (默认: 1-自动): ").strip()
+                        record_type = last_type
+
+                    # 入队前立即校验IP：batch提交是原子的，一条坏数据
+                    # 会连累整批，坏IP绝不能进待提交队列
+                    if record_type == "A" and not manager._is_valid_ipv4(ip):
+                        manager.print_status(f"IPv4地址格式无效: {ip}，请重新输入", "error")
+                        input("\n按回车键继续...")
+                        continue
+                    if record_type == "AAAA" and not manager._is_valid_ipv6(ip):
+                        manager.print_status(f"IPv6地址格式无效: {ip}，请重新输入", "error")
+                        input("\n按回车键继续...")
+                        continue
+
+                    # 选择TTL（回车复用上一条的值）
+                    ttl_input = input(f"请输入TTL值 (默认: {last_ttl}): ").strip()
                     if ttl_input:
                         try:
                             ttl = int(ttl_input)
                         except ValueError:
-                            manager.print_status("TTL必须是数字，使用默认值1", "warning")
-                            ttl = 1
+                            manager.print_status(f"TTL必须是数字，使用默认值{last_ttl}", "warning")
+                            ttl = last_ttl
                     else:
-                        ttl = 1
-                    
-                    # 选择代理状态
-                    proxied_input = input("是否通过Cloudflare代理？(y/N): ").strip().lower()
-                    proxied = proxied_input in ['y', 'yes']
-                    
+                        ttl = last_ttl
+
+                    # 选择代理状态（回车复用上一条的值）
+                    proxied_hint = "(Y/n)" if last_proxied else "(y/N)"
+                    proxied_input = input(f"是否通过Cloudflare代理？{proxied_hint}: ").strip().lower()
+                    if proxied_input:
+                        proxied = proxied_input in YES_INPUTS
+                    else:
+                        proxied = last_proxied
+
+                    # 记住本次参数，下一条记录回车即可复用
+                    last_type, last_ttl, last_proxied = record_type, ttl, proxied
+
                     # 确认添加
                     print(f"\n📋 将要添加的记录:")
                     print(f"   完整域名: {full_domain}")
@@ -1138,14 +1452,16 @@ def main():
                             current_subdomain = ""  # 重置子域名
                             continue
                     
-                    # 执行添加
-                    success = manager.add_dns_record(zone_id, full_domain, ip, record_type, ttl, proxied)
-                    
-                    if success:
-                        manager.print_status("记录添加成功", "success")
-                    else:
-                        manager.print_status("记录添加失败", "error")
-                    
+                    # 加入待提交队列，结束该域名的添加时通过batch端点一次性提交
+                    pending_records.append({
+                        'domain': full_domain,
+                        'ip': ip,
+                        'record_type': record_type,
+                        'ttl': ttl,
+                        'proxied': proxied
+                    })
+                    manager.print_status(f"已加入待提交队列（当前 {len(pending_records)} 条）", "success")
+
                     # 询问是否继续添加
                     while True:
                         continue_choice = input("\n是否继续添加DNS记录？(y-继续/n-更换域名/q-返回主菜单): ").strip().lower()
@@ -1166,6 +1482,11 @@ def main():
                     if continue_choice == 'q':
                         break
                 
+                # 结束该域名的添加，批量提交排队的记录（一次HTTP调用）
+                if pending_records:
+                    manager.add_dns_records(zone_id, pending_records)
+                    input("\n按回车键继续...")
+
                 # 询问是否继续添加其他域名的记录
                 if continue_choice == 'q':
                     break
@@ -1247,6 +1568,9 @@ def main():
             input("\n按回车键继续...")
             clear_screen()
 
+    # 退出前关闭会话，释放连接池中保持的TLS连接
+    manager.session.close()
+
 if __name__ == "__main__":
     try:
         main()
@@ -1,13 +1,10 @@
-import glob
+# 重量级模块（csv/subprocess/concurrent.futures）延迟到实际用到的
+# 步骤内再导入，启动时用户还在回答提示，不必先付这些导入开销
 import os
-import csv
-import subprocess
-import json
-from concurrent.futures import ThreadPoolExecutor, as_completed
-from tqdm import tqdm
-import threading  # 用于文件写入锁，确保线程安全
+import threading  # 用于CSV解析/写盘流水线的消费者线程
 import sys
 import select
+from pathlib import Path
 
 # 交互式获取输入文件名
 print("=" * 60)
@@ -24,18 +21,22 @@ if not input_filename:
 base_name = os.path.splitext(input_filename)[0]
 
 # 创建输出文件夹
-output_folder = base_name
-if not os.path.exists(output_folder):
-    os.makedirs(output_folder)
+output_folder = Path(base_name)
+if not output_folder.exists():
+    output_folder.mkdir(parents=True)
     print(f"已创建输出文件夹: {output_folder}")
 
 # 根据输入文件名动态生成其他文件名（存放在输出文件夹下）
-PROXY_FILE = os.path.join(output_folder, f'{base_name}.txt')  # 代理列表文件
-IPTEST_CSV_FILE = os.path.join(output_folder, f'iptest_{base_name}.csv')  # iptest生成的CSV文件
-IPTEST_TXT_FILE = os.path.join(output_folder, f'iptest_{base_name}.txt')  # iptest提取的代理文件
+PROXY_FILE = output_folder / f'{base_name}.txt'  # 代理列表文件
+IPTEST_CSV_FILE = output_folder / f'iptest_{base_name}.csv'  # iptest生成的CSV文件
+IPTEST_TXT_FILE = output_folder / f'iptest_{base_name}.txt'  # iptest提取的代理文件
 
-# 文件写入锁，确保多线程追加文件时不混乱
-file_lock = threading.Lock()
+# CSV表头别名 -> 规范列名映射，表头扫描时一次dict查找代替多个列表遍历
+COLUMN_ALIASES = {
+    'ip': 'ip', 'ip地址': 'ip', 'ip 地址': 'ip', 'ip address': 'ip', 'ip_address': 'ip',
+    'port': 'port', '端口': 'port', '端口号': 'port',
+    'datacenter': 'dc', '数据中心': 'dc', '数据中心名称': 'dc', 'datacenter name': 'dc', 'provider': 'dc',
+}
 
 def input_with_timeout(prompt, timeout=5, default=""):
     """
@@ -49,15 +50,32 @@ def input_with_timeout(prompt, timeout=5, default=""):
     
     # 在Windows和Unix系统上使用不同的方法检测输入
     if sys.platform == "win32":
-        # Windows系统
+        # Windows系统：WaitForSingleObject挂在控制台输入句柄上，
+        # 有按键事件才唤醒，不再以100ms间隔轮询kbhit空耗CPU
+        import ctypes
         import msvcrt
         import time
-        
-        start_time = time.time()
+
+        WAIT_OBJECT_0 = 0
+        handle = ctypes.windll.kernel32.GetStdHandle(-10)  # STD_INPUT_HANDLE
+
+        deadline = time.time() + timeout
         input_str = ""
-        
-        while time.time() - start_time < timeout:
-            if msvcrt.kbhit():
+
+        while True:
+            remaining_ms = int((deadline - time.time()) * 1000)
+            if remaining_ms <= 0:
+                break
+            rc = ctypes.windll.kernel32.WaitForSingleObject(handle, remaining_ms)
+            if rc != WAIT_OBJECT_0:  # WAIT_TIMEOUT或错误
+                break
+            if not msvcrt.kbhit():
+                # 焦点/鼠标/窗口尺寸等非按键事件同样会唤醒等待，但kbhit
+                # 不会消费它们；不清空缓冲的话循环会空转到超时。此时缓冲
+                # 里没有按键事件，整体清空不会丢键入
+                ctypes.windll.kernel32.FlushConsoleInputBuffer(handle)
+                continue
+            while msvcrt.kbhit():
                 char = msvcrt.getwch()
                 if char == '\r':  # 回车键
                     print()  # 换行
@@ -69,8 +87,7 @@ def input_with_timeout(prompt, timeout=5, default=""):
                 else:
                     input_str += char
                     print(char, end='', flush=True)
-            time.sleep(0.1)
-        
+
         print(f"\n输入超时，使用默认值: {default}")
         return default
     else:
@@ -105,34 +122,90 @@ print("=" * 60)
 
 # 步骤0: 删除之前生成的旧文件
 def cleanup_old_files():
-    """删除之前生成的旧文件"""
-    files_to_remove = [
-        PROXY_FILE,
-        IPTEST_CSV_FILE,
-        IPTEST_TXT_FILE
-    ]
-    
-    for file_path in files_to_remove:
-        try:
-            if os.path.exists(file_path):
-                os.remove(file_path)
-                print(f"已删除旧文件: {file_path}")
-        except Exception as e:
-            print(f"删除文件 {file_path} 时发生异常: {str(e)}")
+    """删除之前生成的旧文件（单次scandir遍历，顺带清理残留的分片文件）"""
+    targets = {PROXY_FILE.name, IPTEST_CSV_FILE.name, IPTEST_TXT_FILE.name}
+
+    try:
+        with os.scandir(output_folder) as it:
+            for entry in it:
+                # 上次运行中断可能残留 chunk_N.txt / part_N.csv 分片
+                if entry.name in targets or entry.name.startswith(('chunk_', 'part_')):
+                    try:
+                        os.unlink(entry.path)
+                        print(f"已删除旧文件: {entry.path}")
+                    except FileNotFoundError:
+                        pass
+                    except Exception as e:
+                        print(f"删除文件 {entry.path} 时发生异常: {str(e)}")
+    except FileNotFoundError:
+        pass
 
 # 执行清理
 cleanup_old_files()
 
 # 步骤1: 从输入文件提取 ip 和 port 并保存到 {base_name}.txt
-if not os.path.exists(PROXY_FILE):
-    try:
-        if not os.path.exists(input_filename):
-            print(f"{input_filename} 不存在，无法提取代理。")
-            exit(1)
-        
-        file_extension = os.path.splitext(input_filename)[1].lower()
-        
-        if file_extension == '.csv':
+# （步骤0刚删除了旧的PROXY_FILE，无需再stat一次确认不存在）
+try:
+    import csv
+
+    if not os.path.exists(input_filename):
+        print(f"{input_filename} 不存在，无法提取代理。")
+        exit(1)
+    
+    file_extension = os.path.splitext(input_filename)[1].lower()
+    
+    if file_extension == '.csv':
+        # 优先走pandas向量化路径：C实现解析+布尔掩码过滤+to_csv批量输出，
+        # 10万行级文件比逐行Python循环快一个数量级；未安装pandas则回退逐行处理
+        try:
+            import pandas as pd
+        except ImportError:
+            pd = None
+
+        if pd is not None:
+            df = pd.read_csv(input_filename, dtype=str, keep_default_na=False)
+            ip_col = port_col = dc_col = None
+            for i, column in enumerate(df.columns):
+                canonical = COLUMN_ALIASES.get(str(column).lower().strip())
+                if canonical == 'ip' and ip_col is None:
+                    ip_col = column
+                elif canonical == 'port' and port_col is None:
+                    port_col = column
+                elif canonical == 'dc' and dc_col is None:
+                    dc_col = column
+
+            # 如果没找到标准列名，尝试使用前两列作为默认
+            if ip_col is None and len(df.columns) > 0:
+                ip_col = df.columns[0]
+                print(f"未找到IP列，使用第一列 '{ip_col}' 作为IP地址")
+            if port_col is None and len(df.columns) > 1:
+                port_col = df.columns[1]
+                print(f"未找到端口列，使用第二列 '{port_col}' 作为端口")
+
+            if ip_col is None or port_col is None:
+                print("CSV中未找到 'ip' 和 'port' 列（忽略大小写）。")
+                exit(1)
+
+            filtered_count = 0
+            if PREFERRED_DATACENTER:
+                if dc_col is None:
+                    print(f"警告: 设置了数据中心过滤 '{PREFERRED_DATACENTER}'，但未找到数据中心列")
+                    print("可用的列名:", list(df.columns))
+                    print("将继续处理所有行，不进行数据中心过滤")
+                else:
+                    mask = df[dc_col].str.strip() == PREFERRED_DATACENTER
+                    filtered_count = int((~mask).sum())
+                    df = df[mask]
+
+            # 去掉IP或端口为空的行后批量写出 "ip port" 行
+            df = df[(df[ip_col].str.strip() != '') & (df[port_col].str.strip() != '')]
+            df[[ip_col, port_col]].to_csv(PROXY_FILE, sep=' ', header=False, index=False)
+            valid_count = len(df)
+
+            print(f"已将 {valid_count} 个IPs和ports提取到 {PROXY_FILE}")
+            if PREFERRED_DATACENTER and dc_col is not None:
+                print(f"根据数据中心 '{PREFERRED_DATACENTER}' 过滤掉了 {filtered_count} 行")
+        else:
             # 处理CSV文件
             with open(input_filename, 'r', newline='', encoding='utf-8') as csvfile:
                 reader = csv.reader(csvfile)
@@ -140,25 +213,22 @@ if not os.path.exists(PROXY_FILE):
                 if headers is None:
                     print("CSV文件为空。")
                     exit(1)
-                
+            
                 # 查找列索引，支持多种中英文列名格式
                 ip_col_idx = -1
                 port_col_idx = -1
                 datacenter_col_idx = -1
-                
+            
                 for i, header in enumerate(headers):
-                    header_lower = header.lower().strip()
-                    
-                    # 匹配IP相关列名
-                    if header_lower in ['ip', 'ip地址', 'ip 地址', 'ip address', 'ip_address']:
+                    canonical = COLUMN_ALIASES.get(header.lower().strip())
+
+                    if canonical == 'ip':
                         ip_col_idx = i
-                    # 匹配端口相关列名  
-                    elif header_lower in ['port', '端口', '端口号']:
+                    elif canonical == 'port':
                         port_col_idx = i
-                    # 匹配数据中心相关列名
-                    elif header_lower in ['datacenter', '数据中心', '数据中心名称', 'datacenter name', 'provider']:
+                    elif canonical == 'dc':
                         datacenter_col_idx = i
-                
+            
                 # 如果没找到标准列名，尝试使用前两列作为默认
                 if ip_col_idx == -1 and len(headers) > 0:
                     ip_col_idx = 0
@@ -166,17 +236,17 @@ if not os.path.exists(PROXY_FILE):
                 if port_col_idx == -1 and len(headers) > 1:
                     port_col_idx = 1
                     print(f"未找到端口列，使用第二列 '{headers[1]}' 作为端口")
-                
+            
                 if ip_col_idx == -1 or port_col_idx == -1:
                     print("CSV中未找到 'ip' 和 'port' 列（忽略大小写）。")
                     exit(1)
-                
+            
                 # 检查是否设置了数据中心过滤但未找到数据中心列
                 if PREFERRED_DATACENTER and datacenter_col_idx == -1:
                     print(f"警告: 设置了数据中心过滤 '{PREFERRED_DATACENTER}'，但未找到数据中心列")
                     print("可用的列名:", headers)
                     print("将继续处理所有行，不进行数据中心过滤")
-                
+            
                 # 读取数据行并写入 {base_name}.txt
                 valid_count = 0
                 filtered_count = 0
@@ -185,7 +255,7 @@ if not os.path.exists(PROXY_FILE):
                         if len(row) > max(ip_col_idx, port_col_idx):
                             ip = row[ip_col_idx].strip()
                             port = row[port_col_idx].strip()
-                            
+                        
                             # 检查数据中心过滤条件
                             if PREFERRED_DATACENTER and datacenter_col_idx != -1:
                                 if len(row) > datacenter_col_idx:
@@ -194,130 +264,232 @@ if not os.path.exists(PROXY_FILE):
                                     if datacenter != PREFERRED_DATACENTER:
                                         filtered_count += 1
                                         continue
-                            
+                        
                             # 直接写入，不做验证
                             if ip and port:
                                 f.write(f"{ip} {port}\n")
                                 valid_count += 1
-                
+            
                 print(f"已将 {valid_count} 个IPs和ports提取到 {PROXY_FILE}")
                 if PREFERRED_DATACENTER and datacenter_col_idx != -1:
                     print(f"根据数据中心 '{PREFERRED_DATACENTER}' 过滤掉了 {filtered_count} 行")
-                    
-        elif file_extension == '.txt':
-            # 处理TXT文件，假设格式为 "ip port" 或 "ip:port"
-            valid_count = 0
-            with open(input_filename, 'r', encoding='utf-8') as infile, \
-                 open(PROXY_FILE, 'w', encoding='utf-8') as outfile:
-                for line in infile:
-                    line = line.strip()
-                    if not line:
+                
+    elif file_extension == '.txt':
+        # 处理TXT文件，假设格式为 "ip port" 或 "ip:port"
+        valid_count = 0
+        with open(input_filename, 'r', encoding='utf-8') as infile, \
+             open(PROXY_FILE, 'w', encoding='utf-8') as outfile:
+            for line in infile:
+                line = line.strip()
+                if not line:
+                    continue
+                
+                # 处理 "ip port" 或 "ip:port" 格式
+                if ' ' in line:
+                    parts = line.split()
+                    if len(parts) >= 2:
+                        ip, port = parts[0], parts[1]
+                    else:
                         continue
-                    
-                    # 处理 "ip port" 或 "ip:port" 格式
-                    if ' ' in line:
-                        parts = line.split()
-                        if len(parts) >= 2:
-                            ip, port = parts[0], parts[1]
-                        else:
-                            continue
-                    elif ':' in line:
-                        parts = line.split(':')
-                        if len(parts) >= 2:
-                            ip, port = parts[0], parts[1]
-                        else:
-                            continue
+                elif ':' in line:
+                    parts = line.split(':')
+                    if len(parts) >= 2:
+                        ip, port = parts[0], parts[1]
                     else:
                         continue
-                    
-                    # 直接写入，不做验证
-                    if ip and port:
-                        outfile.write(f"{ip} {port}\n")
-                        valid_count += 1
-            
-            if valid_count == 0:
-                print("TXT文件中无IP和端口数据。")
-                exit(1)
-            
-            print(f"已将 {valid_count} 个IPs和ports从 {input_filename} 提取到 {PROXY_FILE}")
-            if PREFERRED_DATACENTER:
-                print("注意: TXT文件格式不支持数据中心过滤，已忽略数据中心设置")
-        else:
-            print(f"不支持的文件格式: {file_extension}，请使用.csv或.txt文件")
+                else:
+                    continue
+                
+                # 直接写入，不做验证
+                if ip and port:
+                    outfile.write(f"{ip} {port}\n")
+                    valid_count += 1
+        
+        if valid_count == 0:
+            print("TXT文件中无IP和端口数据。")
             exit(1)
-            
-    except FileNotFoundError:
-        print(f"文件 {input_filename} 不存在。")
-        exit(1)
-    except csv.Error as e:
-        print(f"读取CSV文件时发生错误: {str(e)}")
-        exit(1)
-    except Exception as e:
-        print(f"提取代理时发生异常: {str(e)}")
+        
+        print(f"已将 {valid_count} 个IPs和ports从 {input_filename} 提取到 {PROXY_FILE}")
+        if PREFERRED_DATACENTER:
+            print("注意: TXT文件格式不支持数据中心过滤，已忽略数据中心设置")
+    else:
+        print(f"不支持的文件格式: {file_extension}，请使用.csv或.txt文件")
         exit(1)
+        
+except FileNotFoundError:
+    print(f"文件 {input_filename} 不存在。")
+    exit(1)
+except csv.Error as e:
+    print(f"读取CSV文件时发生错误: {str(e)}")
+    exit(1)
+except Exception as e:
+    print(f"提取代理时发生异常: {str(e)}")
+    exit(1)
 
 # 步骤2: 执行 ./iptest 并处理生成的 CSV
 print("正在执行 ./iptest 命令...")
 try:
-    # 构建iptest命令
-    iptest_command = ['./iptest', '-file', PROXY_FILE, '-outfile', IPTEST_CSV_FILE, '-tls=true']
-    
-    # 执行iptest命令
-    process = subprocess.Popen(iptest_command, stdout=subprocess.PIPE, stderr=subprocess.STDOUT, text=True, bufsize=1, universal_newlines=True)
-    
-    # 实时读取并显示输出
+    import subprocess
+    from concurrent.futures import ThreadPoolExecutor, as_completed
+
+    # 读取代理列表并按CPU核数分片，多个iptest实例并行测试，
+    # 单个IP的测试彼此独立，多核机器上接近线性加速
+    with open(PROXY_FILE, 'r', encoding='utf-8') as f:
+        proxy_lines = [line for line in f if line.strip()]
+
+    # 没有代理就不分片：空列表会让线程池max_workers=0直接抛异常，
+    # 报出来的却是一条含糊的"执行 ./iptest 时发生异常"
+    if not proxy_lines:
+        print(f"{PROXY_FILE} 中无代理数据，无法执行 ./iptest。")
+        exit(1)
+
+    num_chunks = min(os.cpu_count() or 1, max(1, len(proxy_lines)))
+    chunk_size = -(-len(proxy_lines) // num_chunks)  # 向上取整
+    chunk_files = []
+    part_files = []
+    for i in range(num_chunks):
+        chunk_lines = proxy_lines[i * chunk_size:(i + 1) * chunk_size]
+        if not chunk_lines:
+            break
+        chunk_path = output_folder / f'chunk_{i}.txt'
+        part_path = output_folder / f'part_{i}.csv'
+        with open(chunk_path, 'w', encoding='utf-8') as cf:
+            cf.writelines(chunk_lines)
+        chunk_files.append(chunk_path)
+        part_files.append(part_path)
+
+    def run_iptest_chunk(chunk_path, part_path):
+        """对单个分片执行 ./iptest 并实时转发输出，返回进程退出码"""
+        command = ['./iptest', '-file', chunk_path, '-outfile', part_path, '-tls=true']
+        process = subprocess.Popen(command, stdout=subprocess.PIPE, stderr=subprocess.STDOUT)
+        # read1按到达的数据块读取而不是等整行到齐，iptest输出半行缓冲时
+        # drain线程不会卡在readline上，进度显示更及时
+        buf = b''
+        while True:
+            chunk = process.stdout.read1(4096)
+            if not chunk:  # EOF，子进程已关闭stdout
+                break
+            buf += chunk
+            *lines, buf = buf.split(b'\n')
+            for ln in lines:
+                print(ln.decode(errors='replace').strip(), flush=True)
+        if buf.strip():
+            print(buf.decode(errors='replace').strip(), flush=True)
+        return process.wait()
+
+    # 并行执行所有分片，线程池负责各自的stdout泵送避免管道阻塞
     print("=" * 50)
-    print("iptest 执行输出:")
+    print(f"iptest 执行输出（{len(chunk_files)} 个并行分片）:")
     print("=" * 50)
-    
-    while True:
-        output = process.stdout.readline()
-        if output == '' and process.poll() is not None:
-            break
-        if output:
-            print(output.strip())
-    
-    returncode = process.poll()
-    
+
+    with ThreadPoolExecutor(max_workers=len(chunk_files)) as executor:
+        futures = [executor.submit(run_iptest_chunk, c, p) for c, p in zip(chunk_files, part_files)]
+        return_codes = [future.result() for future in as_completed(futures)]
+
+    returncode = next((code for code in return_codes if code != 0), 0)
+
     if returncode != 0:
         print(f"执行 ./iptest 失败，返回码: {returncode}")
     else:
         print("./iptest 执行成功")
-        
+
+        # 合并各分片CSV为最终结果文件（只保留第一个分片的表头）
+        header_written = False
+        with open(IPTEST_CSV_FILE, 'w', encoding='utf-8', newline='') as outfile:
+            for part_path in part_files:
+                # 直接尝试打开，以FileNotFoundError代替先exists后open的两次stat
+                try:
+                    pf = open(part_path, 'r', encoding='utf-8', newline='')
+                except FileNotFoundError:
+                    continue
+                with pf:
+                    header = pf.readline()
+                    if header and not header_written:
+                        outfile.write(header)
+                        header_written = True
+                    for line in pf:
+                        outfile.write(line)
+
+        # 清理分片临时文件
+        for path in chunk_files + part_files:
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+
+
         # 检查是否生成了 CSV 文件
         if os.path.exists(IPTEST_CSV_FILE):
             print(f"检测到 {IPTEST_CSV_FILE} 文件，开始提取代理信息...")
             
-            # 从 iptest CSV 提取 ip 和端口，保存到 iptest_{base_name}.txt
-            seen_proxies = set()  # 用于去重的集合
+            # 从 iptest CSV 流式提取 ip 和端口，保存到 iptest_{base_name}.txt
+            import csv
+
+            try:
+                from xxhash import xxh3_64_intdigest
+            except ImportError:
+                xxh3_64_intdigest = None
+
+            # 可选的xxhash路径：去重集合存64位整数摘要而不是元组，
+            # 百万级条目省几十MB内存且哈希计算更快；未安装则回退元组键
+            if xxh3_64_intdigest is not None:
+                make_key = lambda ip, port: xxh3_64_intdigest(f"{ip}\0{port}".encode())
+            else:
+                make_key = lambda ip, port: (ip, port)
+
+            import queue
+
+            # 生产者/消费者两线程流水线：主线程解析CSV过滤行，消费线程
+            # 去重+批量写盘，两端的I/O都释放GIL，写延迟藏在解析后面
+            row_queue = queue.Queue(maxsize=1024)
+            counters = {'valid': 0}
+
+            def consume_rows():
+                """消费线程：去重后大缓冲+分批writelines写出"""
+                seen_proxies = set()
+                batch = []
+                with open(IPTEST_TXT_FILE, 'w', encoding='utf-8', buffering=1 << 20) as f:
+                    while True:
+                        item = row_queue.get()
+                        if item is None:  # 结束哨兵
+                            break
+                        ip, port = item
+                        proxy_key = make_key(ip, port)  # 唯一标识符
+                        if proxy_key in seen_proxies:  # 检查是否重复
+                            continue
+                        seen_proxies.add(proxy_key)
+                        batch.append(f"{ip} {port}\n")
+                        counters['valid'] += 1
+                        if len(batch) >= 4096:
+                            f.writelines(batch)
+                            batch.clear()
+                    if batch:
+                        f.writelines(batch)
+
             valid_count = 0
             with open(IPTEST_CSV_FILE, 'r', newline='', encoding='utf-8') as csvfile:
-                reader = csv.reader(csvfile)
-                headers = next(reader, None)  # 读取表头行
-                
-                if headers and len(headers) >= 9:  # 确保有足够的列
-                    # 查找IP、端口和国家列的位置
-                    ip_col_idx = 0
-                    port_col_idx = 1
-                    country_col_idx = 8  # 国家在第9列（0-indexed）
-                    
-                    # 写入 iptest_{base_name}.txt，根据优选国家过滤，并去重
-                    with open(IPTEST_TXT_FILE, 'w', encoding='utf-8') as f:
+                reader = csv.DictReader(csvfile)
+                fieldnames = reader.fieldnames or []
+
+                if 'IP地址' in fieldnames and '端口' in fieldnames and '国家' in fieldnames:
+                    # 按列名取值（对列顺序变化健壮），解析线程只负责过滤并入队
+                    writer_thread = threading.Thread(target=consume_rows)
+                    writer_thread.start()
+                    try:
                         for row in reader:
-                            if len(row) > max(ip_col_idx, port_col_idx, country_col_idx):
-                                ip = row[ip_col_idx].strip()
-                                port = row[port_col_idx].strip()
-                                country = row[country_col_idx].strip()
-                                
-                                # 根据是否设置了优选国家来决定过滤条件
-                                if ip and port:
-                                    if not PREFERRED_COUNTRY or country == PREFERRED_COUNTRY:
-                                        proxy_key = f"{ip}:{port}"  # 创建唯一标识符
-                                        if proxy_key not in seen_proxies:  # 检查是否重复
-                                            seen_proxies.add(proxy_key)
-                                            f.write(f"{ip} {port}\n")
-                                            valid_count += 1
-                    
+                            ip = (row.get('IP地址') or '').strip()
+                            port = (row.get('端口') or '').strip()
+                            country = (row.get('国家') or '').strip()
+
+                            # 根据是否设置了优选国家来决定过滤条件
+                            if ip and port:
+                                if not PREFERRED_COUNTRY or country == PREFERRED_COUNTRY:
+                                    row_queue.put((ip, port))
+                    finally:
+                        row_queue.put(None)
+                        writer_thread.join()
+                    valid_count = counters['valid']
+
                     if PREFERRED_COUNTRY:
                         print(f"从 {IPTEST_CSV_FILE} 提取了 {valid_count} 个优选国家 '{PREFERRED_COUNTRY}' 的代理到 {IPTEST_TXT_FILE}")
                     else:
@@ -339,8 +511,10 @@ print("代理处理完成！")
 print("="*80)
 print(f"原始代理列表: {PROXY_FILE}")
 print(f"iptest 结果CSV: {IPTEST_CSV_FILE}")
-if os.path.exists(IPTEST_TXT_FILE):
+try:
     with open(IPTEST_TXT_FILE, 'r', encoding='utf-8') as f:
         proxy_count = len([line for line in f if line.strip()])
     print(f"过滤后的代理列表 ({proxy_count} 个): {IPTEST_TXT_FILE}")
+except FileNotFoundError:
+    pass
 print("="*80)
\ No newline at end of file
@@ -1,13 +1,32 @@
 import glob
 import os
+import re
 import csv
 import subprocess
 import json
-from concurrent.futures import ThreadPoolExecutor, as_completed
-from tqdm import tqdm
-import threading  # 用于文件写入锁，确保线程安全
+import asyncio
+import aiohttp
+from tqdm.asyncio import tqdm
+import threading  # 用于独立的日志写入线程
+import queue
 import sys
+import time
 import select
+from collections import defaultdict
+from operator import itemgetter
+
+# orjson为可选加速：Rust实现的JSON解析比标准库快数倍，且直接接受
+# bytes，省掉一次UTF-8解码；未安装时回退标准库json
+try:
+    import orjson
+    _json_loads = orjson.loads
+except ImportError:
+    _json_loads = json.loads
+
+# 步骤1表头匹配的列名别名，模块级frozenset成员测试O(1)，
+# 不必每次加载文件时重建字面量列表逐项比较
+IP_NAMES = frozenset({'ip', 'ip地址', 'ip 地址', 'ip address', 'ip_address'})
+PORT_NAMES = frozenset({'port', '端口', '端口号'})
 
 # 交互式获取输入文件名
 print("=" * 60)
@@ -37,8 +56,29 @@ IPTEST_CSV_FILE = os.path.join(output_folder, f'iptest_{base_name}.csv')  # ipte
 IPTEST_TXT_FILE = os.path.join(output_folder, f'iptest_{base_name}.txt')  # iptest提取的代理文件
 PREFERRED_PROXY_FILE = os.path.join(output_folder, f'{base_name}_preferred.txt')  # 优选代理保存文件
 
-# 文件写入锁，确保多线程追加文件时不混乱
-file_lock = threading.Lock()
+# 日志写入队列：检查协程只往队列投格式化文本，由单个日志线程
+# 持有文件句柄批量顺序写入，热路径上没有open/close系统调用和锁竞争
+log_q = queue.Queue(maxsize=1024)
+
+def log_put(text):
+    """投递一条日志，队列满时丢弃这条而不阻塞
+
+    检查协程跑在事件循环里，阻塞的put会把整个循环卡住；日志线程
+    由主流程保证已成功打开文件，队列满只是瞬时积压。
+    """
+    try:
+        log_q.put_nowait(text)
+    except queue.Full:
+        pass
+
+def log_writer(log_file):
+    """日志线程：独占文件句柄顺序写入，None为结束哨兵"""
+    with log_file:
+        while True:
+            item = log_q.get()
+            if item is None:
+                break
+            log_file.write(item)
 
 def input_with_timeout(prompt, timeout=5, default=""):
     """
@@ -52,15 +92,31 @@ def input_with_timeout(prompt, timeout=5, default=""):
     
     # 在Windows和Unix系统上使用不同的方法检测输入
     if sys.platform == "win32":
-        # Windows系统
+        # Windows系统：WaitForSingleObject挂在控制台输入句柄上，
+        # 有按键事件才唤醒，不再以100ms间隔轮询kbhit空耗CPU
+        import ctypes
         import msvcrt
-        import time
-        
-        start_time = time.time()
+
+        WAIT_OBJECT_0 = 0
+        handle = ctypes.windll.kernel32.GetStdHandle(-10)  # STD_INPUT_HANDLE
+
+        deadline = time.time() + timeout
         input_str = ""
-        
-        while time.time() - start_time < timeout:
-            if msvcrt.kbhit():
+
+        while True:
+            remaining_ms = int((deadline - time.time()) * 1000)
+            if remaining_ms <= 0:
+                break
+            rc = ctypes.windll.kernel32.WaitForSingleObject(handle, remaining_ms)
+            if rc != WAIT_OBJECT_0:  # WAIT_TIMEOUT或错误
+                break
+            if not msvcrt.kbhit():
+                # 焦点/鼠标/窗口尺寸等非按键事件同样会唤醒等待，但kbhit
+                # 不会消费它们；不清空缓冲的话循环会空转到超时。此时缓冲
+                # 里没有按键事件，整体清空不会丢键入
+                ctypes.windll.kernel32.FlushConsoleInputBuffer(handle)
+                continue
+            while msvcrt.kbhit():
                 char = msvcrt.getwch()
                 if char == '\r':  # 回车键
                     print()  # 换行
@@ -72,8 +128,7 @@ def input_with_timeout(prompt, timeout=5, default=""):
                 else:
                     input_str += char
                     print(char, end='', flush=True)
-            time.sleep(0.1)
-        
+
         print(f"\n输入超时，使用默认值: {default}")
         return default
     else:
@@ -111,12 +166,34 @@ PREFERRED_PROXY_PORT = input_with_timeout(
     default=""
 )
 
+# 优选端口在配置阶段就解析成int集合，筛选循环里按整数O(1)查询，
+# 不必每行把端口转回字符串比较
+try:
+    PREFERRED_PORTS = frozenset(int(p) for p in PREFERRED_PROXY_PORT.split(',') if p.strip())
+except ValueError:
+    print(f"端口格式无效，忽略端口筛选: '{PREFERRED_PROXY_PORT}'")
+    PREFERRED_PROXY_PORT = ""
+    PREFERRED_PORTS = frozenset()
+
+# 并发检查数配置：检查任务纯网络等待，单线程事件循环即可撑起数百并发
+try:
+    concurrency_input = input_with_timeout(
+        f"请输入最大并发检查数（10秒后默认使用200）: ",
+        timeout=10,
+        default="200"
+    )
+    MAX_CONCURRENT_CHECKS = max(1, int(concurrency_input))
+except ValueError:
+    print(f"输入无效，使用默认值: 200")
+    MAX_CONCURRENT_CHECKS = 200
+
 print("\n配置完成:")
 print(f"  输入文件: {input_filename}")
 print(f"  输出文件夹: {output_folder}")
 print(f"  优选国家: '{PREFERRED_COUNTRY}'")
 print(f"  最大响应时间: {PREFERRED_MAX_RESPONSE_TIME}ms")
 print(f"  优选端口: '{PREFERRED_PROXY_PORT}'")
+print(f"  最大并发检查数: {MAX_CONCURRENT_CHECKS}")
 print("=" * 60)
 
 # 步骤0: 删除之前生成的旧文件
@@ -131,12 +208,15 @@ def cleanup_old_files():
         PREFERRED_PROXY_FILE
     ]
     
+    # 直接unlink并捕获FileNotFoundError，每个文件一次系统调用，
+    # 免去exists+remove的两次调用和中间的竞态窗口
     for file_path in files_to_remove:
         try:
-            if os.path.exists(file_path):
-                os.remove(file_path)
-                print(f"已删除旧文件: {file_path}")
-        except Exception as e:
+            os.remove(file_path)
+            print(f"已删除旧文件: {file_path}")
+        except FileNotFoundError:
+            pass
+        except OSError as e:
             print(f"删除文件 {file_path} 时发生异常: {str(e)}")
 
 # 执行清理
@@ -152,94 +232,122 @@ if not os.path.exists(PROXY_FILE):
         file_extension = os.path.splitext(input_filename)[1].lower()
         
         if file_extension == '.csv':
-            # 处理CSV文件
-            with open(input_filename, 'r', newline='', encoding='utf-8') as csvfile:
-                reader = csv.reader(csvfile)
-                headers = next(reader, None)  # 读取表头行
-                if headers is None:
-                    print("CSV文件为空。")
+            # 优先走pandas向量化路径：C解析器一次读入+to_csv批量写出，
+            # 大文件比逐行Python循环快一个数量级；未安装pandas则回退逐行处理
+            try:
+                import pandas as pd
+            except ImportError:
+                pd = None
+
+            if pd is not None:
+                df = pd.read_csv(input_filename, dtype=str, keep_default_na=False)
+                norm_cols = [str(c).lower().strip() for c in df.columns]
+                ip_col = next((df.columns[i] for i, c in enumerate(norm_cols) if c in IP_NAMES), None)
+                port_col = next((df.columns[i] for i, c in enumerate(norm_cols) if c in PORT_NAMES), None)
+
+                # 如果没找到标准列名，尝试使用前两列作为默认
+                if ip_col is None and len(df.columns) > 0:
+                    ip_col = df.columns[0]
+                    print(f"未找到IP列，使用第一列 '{ip_col}' 作为IP地址")
+                if port_col is None and len(df.columns) > 1:
+                    port_col = df.columns[1]
+                    print(f"未找到端口列，使用第二列 '{port_col}' 作为端口")
+
+                if ip_col is None or port_col is None:
+                    print("CSV中未找到 'ip' 和 'port' 列（忽略大小写）。")
+                    exit(1)
+
+                # 去掉IP或端口为空的行并按(ip, port)去重后批量写出 "ip port" 行
+                df = df[(df[ip_col].str.strip() != '') & (df[port_col].str.strip() != '')]
+                df = df.drop_duplicates(subset=[ip_col, port_col])
+                valid_count = len(df)
+                if valid_count == 0:
+                    print("CSV中无IP和端口数据。")
                     exit(1)
+                df[[ip_col, port_col]].to_csv(PROXY_FILE, sep=' ', header=False, index=False)
+                print(f"已将 {valid_count} 个IPs和ports提取到 {PROXY_FILE}")
+            else:
+                # 处理CSV文件
+                with open(input_filename, 'r', newline='', encoding='utf-8') as csvfile:
+                    reader = csv.reader(csvfile)
+                    headers = next(reader, None)  # 读取表头行
+                    if headers is None:
+                        print("CSV文件为空。")
+                        exit(1)
                 
-                # 查找列索引，支持多种中英文列名格式
-                ip_col_idx = -1
-                port_col_idx = -1
+                    # 查找列索引，支持多种中英文列名格式
+                    ip_col_idx = -1
+                    port_col_idx = -1
                 
-                for i, header in enumerate(headers):
-                    header_lower = header.lower().strip()
-                    
-                    # 匹配IP相关列名
-                    if header_lower in ['ip', 'ip地址', 'ip 地址', 'ip address', 'ip_address']:
-                        ip_col_idx = i
-                    # 匹配端口相关列名  
-                    elif header_lower in ['port', '端口', '端口号']:
-                        port_col_idx = i
+                    for i, header in enumerate(headers):
+                        header_lower = header.lower().strip()
+
+                        # 匹配IP相关列名
+                        if header_lower in IP_NAMES:
+                            ip_col_idx = i
+                        # 匹配端口相关列名
+                        elif header_lower in PORT_NAMES:
+                            port_col_idx = i
                 
-                # 如果没找到标准列名，尝试使用前两列作为默认
-                if ip_col_idx == -1 and len(headers) > 0:
-                    ip_col_idx = 0
-                    print(f"未找到IP列，使用第一列 '{headers[0]}' 作为IP地址")
-                if port_col_idx == -1 and len(headers) > 1:
-                    port_col_idx = 1
-                    print(f"未找到端口列，使用第二列 '{headers[1]}' 作为端口")
+                    # 如果没找到标准列名，尝试使用前两列作为默认
+                    if ip_col_idx == -1 and len(headers) > 0:
+                        ip_col_idx = 0
+                        print(f"未找到IP列，使用第一列 '{headers[0]}' 作为IP地址")
+                    if port_col_idx == -1 and len(headers) > 1:
+                        port_col_idx = 1
+                        print(f"未找到端口列，使用第二列 '{headers[1]}' 作为端口")
                 
-                if ip_col_idx == -1 or port_col_idx == -1:
-                    print("CSV中未找到 'ip' 和 'port' 列（忽略大小写）。")
-                    exit(1)
+                    if ip_col_idx == -1 or port_col_idx == -1:
+                        print("CSV中未找到 'ip' 和 'port' 列（忽略大小写）。")
+                        exit(1)
                 
-                # 读取数据行并写入 {base_name}.txt
-                valid_count = 0
-                with open(PROXY_FILE, 'w', encoding='utf-8') as f:
-                    for row in reader:
-                        if len(row) > max(ip_col_idx, port_col_idx):
-                            ip = row[ip_col_idx].strip()
-                            port = row[port_col_idx].strip()
-                            
-                            # 直接写入，不做验证
-                            if ip and port:
-                                f.write(f"{ip} {port}\n")
-                                valid_count += 1
+                    # 读取数据行并写入 {base_name}.txt，(ip, port)去重避免重复测试
+                    valid_count = 0
+                    seen = set()
+                    with open(PROXY_FILE, 'w', encoding='utf-8') as f:
+                        for row in reader:
+                            if len(row) > max(ip_col_idx, port_col_idx):
+                                ip = row[ip_col_idx].strip()
+                                port = row[port_col_idx].strip()
+
+                                # 直接写入，不做验证
+                                if ip and port and (ip, port) not in seen:
+                                    seen.add((ip, port))
+                                    f.write(f"{ip} {port}\n")
+                                    valid_count += 1
                 
-                if valid_count == 0:
-                    print("CSV中无IP和端口数据。")
-                    exit(1)
+                    if valid_count == 0:
+                        print("CSV中无IP和端口数据。")
+                        exit(1)
                 
-                print(f"已将 {valid_count} 个IPs和ports提取到 {PROXY_FILE}")
+                    print(f"已将 {valid_count} 个IPs和ports提取到 {PROXY_FILE}")
                     
         elif file_extension == '.txt':
-            # 处理TXT文件，假设格式为 "ip port" 或 "ip:port"
-            valid_count = 0
-            with open(input_filename, 'r', encoding='utf-8') as infile, \
-                 open(PROXY_FILE, 'w', encoding='utf-8') as outfile:
-                for line in infile:
-                    line = line.strip()
-                    if not line:
-                        continue
-                    
-                    # 处理 "ip port" 或 "ip:port" 格式
-                    if ' ' in line:
-                        parts = line.split()
-                        if len(parts) >= 2:
-                            ip, port = parts[0], parts[1]
-                        else:
-                            continue
-                    elif ':' in line:
-                        parts = line.split(':')
-                        if len(parts) >= 2:
-                            ip, port = parts[0], parts[1]
-                        else:
-                            continue
-                    else:
-                        continue
-                    
-                    # 直接写入，不做验证
-                    if ip and port:
-                        outfile.write(f"{ip} {port}\n")
-                        valid_count += 1
-            
+            # 处理TXT文件，"ip port" 或 "ip:port" 格式。
+            # mmap+字节级正则一次C层扫描提取全部(ip, port)对，替代逐行
+            # strip/split产生的大量临时字符串；结果一次批量写出
+            import mmap
+
+            # 分隔符允许连续的空格/制表符或冒号，对齐基线line.split()的
+            # 宽容度；不含\n，免得只有IP的行跨行配上下一行的数字
+            ipport_re = re.compile(rb'(\d+\.\d+\.\d+\.\d+)[ \t:]+(\d{1,5})')
+
+            with open(input_filename, 'rb') as infile:
+                try:
+                    buf = mmap.mmap(infile.fileno(), 0, access=mmap.ACCESS_READ)
+                except ValueError:
+                    buf = b''  # 空文件无法mmap
+                # dict.fromkeys保序去重，重复的(ip, port)只测一次
+                pairs = list(dict.fromkeys(ipport_re.findall(buf)))
+
+            valid_count = len(pairs)
             if valid_count == 0:
                 print("TXT文件中无IP和端口数据。")
                 exit(1)
-            
+
+            with open(PROXY_FILE, 'wb') as outfile:
+                outfile.write(b'\n'.join(b'%s %s' % pair for pair in pairs) + b'\n')
+
             print(f"已将 {valid_count} 个IPs和ports从 {input_filename} 提取到 {PROXY_FILE}")
         else:
             print(f"不支持的文件格式: {file_extension}，请使用.csv或.txt文件")
@@ -261,68 +369,102 @@ try:
     # 构建iptest命令
     iptest_command = ['./iptest', '-file', PROXY_FILE, '-outfile', IPTEST_CSV_FILE, '-tls=true']
     
-    # 执行iptest命令
-    process = subprocess.Popen(iptest_command, stdout=subprocess.PIPE, stderr=subprocess.STDOUT, text=True, bufsize=1, universal_newlines=True)
-    
+    # 执行iptest命令。不开text=True，stdout保持bytes按块读出，
+    # 只在打印时解码一次，省掉文本层的增量UTF-8解码和换行翻译
+    process = subprocess.Popen(iptest_command, stdout=subprocess.PIPE, stderr=subprocess.STDOUT)
+
+    # 增量解析线程：iptest边跑边往CSV追加结果，这里跟着文件增长
+    # 解析新写入的完整行，过滤国家并去重，把提取工作与外部进程的
+    # 运行时间重叠起来，进程退出后只剩收尾写出
+    iptest_done = threading.Event()
+    parsed_rows = []  # 过滤去重后的 "ip port\n" 行
+    seen_proxies = set()  # 用于去重的集合
+    csv_state = {'header_seen': False, 'format_ok': True}
+
+    def tail_csv_rows():
+        """跟随 IPTEST_CSV_FILE 增长解析完整行，半行留到下一轮"""
+        pos = 0
+        pending = ''
+        while True:
+            finished = iptest_done.is_set()
+            chunk = ''
+            try:
+                with open(IPTEST_CSV_FILE, 'r', newline='', encoding='utf-8') as f:
+                    f.seek(pos)
+                    chunk = f.read()
+                    pos = f.tell()
+            except FileNotFoundError:
+                pass  # iptest还没创建输出文件
+            if chunk:
+                pending += chunk
+                lines = pending.split('\n')
+                pending = lines.pop()  # 末段可能是未写完的半行
+                for row in csv.reader(lines):
+                    if not row:
+                        continue
+                    if not csv_state['header_seen']:
+                        csv_state['header_seen'] = True
+                        if len(row) < 9:  # 确保有足够的列
+                            csv_state['format_ok'] = False
+                            return
+                        continue
+                    # IP在第1列、端口第2列、国家第9列（0-indexed）
+                    if len(row) <= 8:
+                        continue
+                    ip = row[0].strip()
+                    port = row[1].strip()
+                    country = row[8].strip()
+                    if ip and port:
+                        if not PREFERRED_COUNTRY or country == PREFERRED_COUNTRY:
+                            if (ip, port) not in seen_proxies:
+                                seen_proxies.add((ip, port))
+                                parsed_rows.append(f"{ip} {port}\n")
+            if finished:
+                break
+            time.sleep(0.5)
+
+    parser_thread = threading.Thread(target=tail_csv_rows)
+    parser_thread.start()
+
     # 实时读取并显示输出
     print("=" * 50)
     print("iptest 执行输出:")
     print("=" * 50)
     
+    # read1按到达的数据块读取而不是等整行到齐，半行缓冲时不会卡在
+    # readline上，进度显示更及时
+    buf = b''
     while True:
-        output = process.stdout.readline()
-        if output == '' and process.poll() is not None:
+        chunk = process.stdout.read1(4096)
+        if not chunk:  # EOF，子进程已关闭stdout
             break
-        if output:
-            print(output.strip())
-    
-    returncode = process.poll()
-    
+        buf += chunk
+        *lines, buf = buf.split(b'\n')
+        for ln in lines:
+            print(ln.decode(errors='replace').strip(), flush=True)
+    if buf.strip():
+        print(buf.decode(errors='replace').strip(), flush=True)
+
+    returncode = process.wait()
+    iptest_done.set()
+    parser_thread.join()
+
     if returncode != 0:
         print(f"执行 ./iptest 失败，返回码: {returncode}")
     else:
         print("./iptest 执行成功")
-        
-        # 检查是否生成了 CSV 文件
-        if os.path.exists(IPTEST_CSV_FILE):
-            print(f"检测到 {IPTEST_CSV_FILE} 文件，开始提取代理信息...")
-            
-            # 从 iptest CSV 提取 ip 和端口，保存到 iptest_{base_name}.txt
-            seen_proxies = set()  # 用于去重的集合
-            valid_count = 0
-            with open(IPTEST_CSV_FILE, 'r', newline='', encoding='utf-8') as csvfile:
-                reader = csv.reader(csvfile)
-                headers = next(reader, None)  # 读取表头行
-                
-                if headers and len(headers) >= 9:  # 确保有足够的列
-                    # 查找IP、端口和国家列的位置
-                    ip_col_idx = 0
-                    port_col_idx = 1
-                    country_col_idx = 8  # 国家在第9列（0-indexed）
-                    
-                    # 写入 iptest_{base_name}.txt，根据优选国家过滤，并去重
-                    with open(IPTEST_TXT_FILE, 'w', encoding='utf-8') as f:
-                        for row in reader:
-                            if len(row) > max(ip_col_idx, port_col_idx, country_col_idx):
-                                ip = row[ip_col_idx].strip()
-                                port = row[port_col_idx].strip()
-                                country = row[country_col_idx].strip()
-                                
-                                # 根据是否设置了优选国家来决定过滤条件
-                                if ip and port:
-                                    if not PREFERRED_COUNTRY or country == PREFERRED_COUNTRY:
-                                        proxy_key = f"{ip}:{port}"  # 创建唯一标识符
-                                        if proxy_key not in seen_proxies:  # 检查是否重复
-                                            seen_proxies.add(proxy_key)
-                                            f.write(f"{ip} {port}\n")
-                                            valid_count += 1
-                    
-                    if PREFERRED_COUNTRY:
-                        print(f"从 {IPTEST_CSV_FILE} 提取了 {valid_count} 个优选国家 '{PREFERRED_COUNTRY}' 的代理到 {IPTEST_TXT_FILE}")
-                    else:
-                        print(f"从 {IPTEST_CSV_FILE} 提取了 {valid_count} 个所有国家的代理到 {IPTEST_TXT_FILE}")
-                else:
-                    print(f"{IPTEST_CSV_FILE} 文件格式不正确")
+
+        if not csv_state['format_ok']:
+            print(f"{IPTEST_CSV_FILE} 文件格式不正确")
+        elif csv_state['header_seen']:
+            # 提取过滤已随iptest运行增量完成，这里只整批写出结果
+            valid_count = len(parsed_rows)
+            with open(IPTEST_TXT_FILE, 'w', encoding='utf-8', buffering=1 << 20) as f:
+                f.write(''.join(parsed_rows))
+            if PREFERRED_COUNTRY:
+                print(f"从 {IPTEST_CSV_FILE} 提取了 {valid_count} 个优选国家 '{PREFERRED_COUNTRY}' 的代理到 {IPTEST_TXT_FILE}")
+            else:
+                print(f"从 {IPTEST_CSV_FILE} 提取了 {valid_count} 个所有国家的代理到 {IPTEST_TXT_FILE}")
         else:
             print(f"未找到 {IPTEST_CSV_FILE} 文件")
             
@@ -340,7 +482,9 @@ proxy_source_file = IPTEST_TXT_FILE if os.path.exists(IPTEST_TXT_FILE) else PROX
 try:
     if os.path.exists(proxy_source_file):
         with open(proxy_source_file, 'r', encoding='utf-8') as f:
-            proxies = [line.strip() for line in f if line.strip() and len(line.split()) == 2]
+            # dict.fromkeys保序去重，避免对重复代理发起多余的网络检查
+            proxies = list(dict.fromkeys(
+                line.strip() for line in f if line.strip() and len(line.split()) == 2))
     if not proxies:
         print(f"{proxy_source_file} 中无有效代理，将退出。")
         exit(1)
@@ -352,192 +496,196 @@ except Exception as e:
     print(f"读取 {proxy_source_file} 时发生异常: {str(e)}")
     exit(1)
 
-# 清空日志文件（开始新检查）
-try:
-    with open(FULL_RESPONSES_FILE, 'w', encoding='utf-8'):
-        pass
-except Exception as e:
-    print(f"清空 {FULL_RESPONSES_FILE} 时发生异常: {str(e)}")
-    exit(1)
-
-# 步骤4: 定义检查单个代理的函数
-def check_proxy(ip_port):
+# 步骤4: 定义检查单个代理的异步函数
+async def check_proxy(session, ip_port):
     """
     检查单个代理的有效性，并保存完整响应信息
+
+    复用传入session的连接池，免去每个代理一次curl进程的
+    fork/exec和TLS握手开销。
     """
     try:
         ip, port = ip_port.split()  # 假设格式正确，否则跳过
     except ValueError as e:
-        with file_lock:
-            try:
-                with open(FULL_RESPONSES_FILE, 'a', encoding='utf-8') as full_file:
-                    full_file.write(f"\n--- 代理: {ip_port} ---\n")
-                    full_file.write(f"无效代理格式: {str(e)}\n\n")
-            except Exception as write_e:
-                print(f"写入 {FULL_RESPONSES_FILE} 时发生异常: {str(write_e)}")
+        log_put(f"\n--- 代理: {ip_port} ---\n无效代理格式: {str(e)}\n\n")
         return None
-    
+
     url = f"https://check.proxyip.eytan.netlib.re/check?proxyip={ip}:{port}"
     header = f"{ip}:{port}"
-    stdout = ""
+    header_port = port
+    raw = b""
     stderr = ""
     returncode = 1
-    
+
     try:
-        # 使用subprocess运行curl，设置超时10秒
-        result = subprocess.run(['curl', '-s', url], capture_output=True, text=True, timeout=10)
-        returncode = result.returncode
-        stdout = result.stdout.strip()
-        stderr = result.stderr.strip()
-        
-        # 尝试解析JSON，更新header
-        if stdout:
-            data = json.loads(stdout)
-            header_ip = data.get('proxyIP', ip)
-            header_port = str(data.get('portRemote', port))
-            header = f"{header_ip}:{header_port}"
-    except subprocess.TimeoutExpired:
+        async with session.get(url, timeout=aiohttp.ClientTimeout(total=10)) as response:
+            # 保持bytes原样读出，JSON解析直接吃bytes，仅日志解码一次
+            raw = await response.read()
+            returncode = 0
+    except asyncio.TimeoutError:
         stderr = "请求超时"
-    except json.JSONDecodeError:
-        stderr = "JSON解析失败"
-    except subprocess.CalledProcessError as e:
-        stderr = f"subprocess调用错误: {str(e)}"
+    except aiohttp.ClientError as e:
+        stderr = f"请求错误: {str(e)}"
     except Exception as e:
         stderr = f"异常: {str(e)}"
-    
-    # 使用锁安全追加到日志文件
-    with file_lock:
-        try:
-            with open(FULL_RESPONSES_FILE, 'a', encoding='utf-8') as full_file:
-                full_file.write(f"\n--- 代理: {header} ---\n")
-                full_file.write("检查结果:\n")
-                full_file.write(f"STDOUT: {stdout}\n")
-                full_file.write(f"STDERR: {stderr}\n")
-                full_file.write(f"Return Code: {returncode}\n\n")
-        except Exception as write_e:
-            print(f"写入 {FULL_RESPONSES_FILE} 时发生异常: {str(write_e)}")
-    
-    # 检查是否成功
+
+    # 检查是否成功（响应JSON只解析一次）
     success = False
     response_time = -1
-    if returncode == 0 and stdout:
+    if returncode == 0 and raw:
         try:
-            data = json.loads(stdout)
+            data = _json_loads(raw)
+            header_ip = data.get('proxyIP', ip)
+            header_port = str(data.get('portRemote', port))
+            header = f"{header_ip}:{header_port}"
             success = data.get('success', False)
             response_time = data.get('responseTime', -1)
-        except json.JSONDecodeError:
-            pass
-    
+        except ValueError:
+            stderr = "JSON解析失败"
+
+    stdout = raw.decode('utf-8', errors='replace').strip()
+
+    # 整块日志一次投入队列，由日志线程落盘
+    log_put(
+        f"\n--- 代理: {header} ---\n"
+        "检查结果:\n"
+        f"STDOUT: {stdout}\n"
+        f"STDERR: {stderr}\n"
+        f"Return Code: {returncode}\n\n"
+    )
+
     if success and response_time != -1:
         proxy_entry = f"{header}#{response_time}ms"
-        return (response_time, proxy_entry)
-    
+        # 端口随元组一路携带，后续排序和筛选不必再从字符串里解析
+        try:
+            port_num = int(header_port)
+        except ValueError:
+            port_num = 65536  # 端口异常的条目排到最后
+        return (port_num, response_time, proxy_entry)
+
     return None
 
-# 步骤5: 使用 ThreadPoolExecutor 进行并发检查
+# 步骤5: 单事件循环 + 共享连接池并发检查所有代理
+async def run_checks(proxy_list):
+    """
+    并发检查所有代理并返回成功条目列表
+
+    TCPConnector共享连接池复用到检查服务的TLS连接，有效并发
+    从线程池的10提升到数百。
+    """
+    # 检查服务的主机名恒定，DNS缓存10分钟把N次解析收敛为1次
+    connector = aiohttp.TCPConnector(
+        limit=MAX_CONCURRENT_CHECKS, ttl_dns_cache=600, use_dns_cache=True)
+
+    # 全局截止时间：按"批数×单次超时+余量"估算，封顶整轮尾部延迟，
+    # 个别在TLS握手上卡死的代理不再拖住收尾写出
+    deadline = time.monotonic() + len(proxy_list) * 10 / MAX_CONCURRENT_CHECKS + 30
+
+    # 任务数已知，预分配结果槽按提交序就位写入，收集阶段没有
+    # append扩容，结果天然保持输入顺序
+    results = [None] * len(proxy_list)
+
+    async def run_one(index, proxy):
+        results[index] = await check_proxy(session, proxy)
+
+    async with aiohttp.ClientSession(connector=connector) as session:
+        tasks = [asyncio.ensure_future(run_one(i, proxy)) for i, proxy in enumerate(proxy_list)]
+        for future in tqdm.as_completed(tasks, total=len(tasks), desc="正在检查代理", unit="个"):
+            try:
+                await asyncio.wait_for(future, timeout=deadline - time.monotonic())
+            except asyncio.TimeoutError:
+                # 到达全局截止时间，取消所有未完成的检查
+                pending = [t for t in tasks if not t.done()]
+                for t in pending:
+                    t.cancel()
+                await asyncio.gather(*tasks, return_exceptions=True)
+                print(f"\n达到全局截止时间，已取消剩余 {len(pending)} 个未完成的检查")
+                break
+            except Exception as e:
+                print(f"处理代理时发生异常: {str(e)}")
+    # 失败或被取消的槽位仍为None，压缩后返回成功条目
+    return [r for r in results if r]
+
+# 先在主流程打开日志文件（'w'打开即截断旧日志），打不开立即报错
+# 退出，不让检查协程往一个没有消费者的队列里投递
 try:
-    max_workers = min(10, len(proxies))  # 限制最大线程数，避免资源耗尽
-    successful_proxies = []
-    with ThreadPoolExecutor(max_workers=max_workers) as executor:
-        future_to_proxy = {executor.submit(check_proxy, proxy): proxy for proxy in proxies}
-        with tqdm(total=len(proxies), desc="正在检查代理", unit="个") as pbar:
-            for future in as_completed(future_to_proxy):
-                try:
-                    result = future.result()
-                    if result:
-                        successful_proxies.append(result)
-                except Exception as e:
-                    print(f"处理代理 {future_to_proxy[future]} 时发生异常: {str(e)}")
-                pbar.update(1)
+    log_file = open(FULL_RESPONSES_FILE, 'w', encoding='utf-8', buffering=1 << 16)
+except OSError as e:
+    print(f"打开 {FULL_RESPONSES_FILE} 时发生异常: {str(e)}")
+    exit(1)
+
+try:
+    log_thread = threading.Thread(target=log_writer, args=(log_file,))
+    log_thread.start()
+    try:
+        successful_proxies = asyncio.run(run_checks(proxies))
+    finally:
+        log_q.put(None)  # 结束哨兵，等日志线程把队列写完
+        log_thread.join()
 except Exception as e:
     print(f"并发检查代理时发生异常: {str(e)}")
     exit(1)
 
-# 按 responseTime 排序（从小到大）
-successful_proxies.sort(key=lambda x: x[0])
-
 # 步骤6: 保存成功代理到 {base_name}_success.txt
 try:
-    # 先按端口从小到大排，端口相同则按响应时间从小到大排
-    def get_port_and_time(proxy_entry):
-        """从代理条目中提取端口和响应时间"""
-        try:
-            ip_port_part = proxy_entry[1].split('#')[0]
-            _, port = ip_port_part.rsplit(':', 1)
-            response_time = proxy_entry[0]
-            return (int(port), response_time)
-        except (ValueError, IndexError):
-            # 如果解析失败，返回一个很大的端口和响应时间，确保排在最后
-            return (65536, 99999)
-    
-    # 按端口和响应时间排序
-    successful_proxies_sorted = sorted(successful_proxies, key=get_port_and_time)
-    
-    with open(SUCCESS_PROXY_FILE, 'w', encoding='utf-8') as f:
-        for _, proxy in successful_proxies_sorted:
-            f.write(f"{proxy}\n")
+    # 端口基数远小于条目数：O(N)按端口装桶，只对去重后的端口做比较
+    # 排序，桶内再按响应时间排，替代整表(端口, 响应时间)复合键排序
+    by_port = defaultdict(list)
+    for port_num, response_time, proxy in successful_proxies:
+        by_port[port_num].append((response_time, proxy))
+
+    successful_proxies_sorted = []
+    for port_num in sorted(by_port):
+        bucket = by_port[port_num]
+        bucket.sort(key=itemgetter(0))
+        successful_proxies_sorted.extend(
+            (port_num, response_time, proxy) for response_time, proxy in bucket)
+
+    # 融合遍历：写成功文件的同一趟循环里顺带完成优选阈值和端口
+    # 筛选，后面步骤7只剩写出，不再把列表整个再过一遍。端口和
+    # 响应时间随check_proxy的返回元组一路携带，源列表已按
+    # (端口, 响应时间)排好序，筛选结果天然有序
+    preferred_proxies = []
+    preferred_port_proxies = []  # 根据端口筛选后的代理
+
+    success_lines = []
+    for port_num, response_time, proxy in successful_proxies_sorted:
+        success_lines.append(proxy)
+        # 如果响应时间小于设定阈值，则添加到优选列表
+        if response_time < PREFERRED_MAX_RESPONSE_TIME:
+            preferred_proxies.append((port_num, response_time, proxy))
+            if port_num in PREFERRED_PORTS:
+                preferred_port_proxies.append((port_num, response_time, proxy))
+
+    # 整批拼接后一次write，1MB缓冲，避免逐行小写入的系统调用开销；
+    # 无成功代理时保持文件为空，不写孤立的换行
+    with open(SUCCESS_PROXY_FILE, 'w', encoding='utf-8', buffering=1 << 20) as f:
+        if success_lines:
+            f.write('\n'.join(success_lines) + '\n')
     print(f"提取了 {len(successful_proxies_sorted)} 个有效代理到 {SUCCESS_PROXY_FILE}")
 except Exception as e:
     print(f"保存 {SUCCESS_PROXY_FILE} 时发生异常: {str(e)}")
     exit(1)
 
-# 步骤7: 从成功代理中提取优选代理到 {base_name}_preferred.txt
+# 步骤7: 把步骤6筛选出的优选代理写到 {base_name}_preferred.txt
 try:
     # 清空优选代理文件
     with open(PREFERRED_PROXY_FILE, 'w', encoding='utf-8') as f:
         pass
-    
-    preferred_proxies = []
-    preferred_port_proxies = []  # 根据端口筛选后的代理
-    
-    if os.path.exists(SUCCESS_PROXY_FILE):
-        with open(SUCCESS_PROXY_FILE, 'r', encoding='utf-8') as f:
-            for line in f:
-                line = line.strip()
-                if not line:
-                    continue
-                try:
-                    # 提取响应时间和端口
-                    ip_port_part = line.split('#')[0]
-                    _, port = ip_port_part.rsplit(':', 1)
-                    response_time = int(line.split('#')[1].replace('ms', ''))
-                    
-                    # 如果响应时间小于设定阈值，则添加到优选列表
-                    if response_time < PREFERRED_MAX_RESPONSE_TIME:
-                        preferred_proxies.append((response_time, line, port))
-                except (ValueError, IndexError):
-                    print(f"无效行格式: {line}")
-                    continue
-    
-    # 按端口（从小到大）和响应时间（从小到大）排序
-    preferred_proxies.sort(key=lambda x: (int(x[2]), x[0]))
-    
-    # 如果设置了优选反代端口，进行端口筛选
+
     if PREFERRED_PROXY_PORT:
-        # 处理多个端口的情况（用逗号分隔）
-        preferred_ports = [p.strip() for p in PREFERRED_PROXY_PORT.split(',') if p.strip()]
-        
-        for response_time, proxy, port in preferred_proxies:
-            if port in preferred_ports:
-                preferred_port_proxies.append((response_time, proxy))
-        
-        # 按端口和响应时间排序
-        preferred_port_proxies_sorted = sorted(preferred_port_proxies, key=lambda x: get_port_and_time(x))
-        
         # 保存端口筛选后的优选代理
-        if preferred_port_proxies_sorted:
-            with open(PREFERRED_PROXY_FILE, 'w', encoding='utf-8') as f:
-                for _, proxy in preferred_port_proxies_sorted:
-                    f.write(f"{proxy}\n")
-            print(f"提取了 {len(preferred_port_proxies_sorted)} 个响应时间小于{PREFERRED_MAX_RESPONSE_TIME}ms且端口为{PREFERRED_PROXY_PORT}的优选代理到 {PREFERRED_PROXY_FILE}")
+        if preferred_port_proxies:
+            with open(PREFERRED_PROXY_FILE, 'w', encoding='utf-8', buffering=1 << 20) as f:
+                f.write('\n'.join(proxy for _, _, proxy in preferred_port_proxies) + '\n')
+            print(f"提取了 {len(preferred_port_proxies)} 个响应时间小于{PREFERRED_MAX_RESPONSE_TIME}ms且端口为{PREFERRED_PROXY_PORT}的优选代理到 {PREFERRED_PROXY_FILE}")
         else:
             print(f"无响应时间小于{PREFERRED_MAX_RESPONSE_TIME}ms且端口为{PREFERRED_PROXY_PORT}的优选代理。")
     else:
         # 没有设置端口筛选，直接保存所有优选代理（已排序）
         if preferred_proxies:
-            with open(PREFERRED_PROXY_FILE, 'w', encoding='utf-8') as f:
-                for _, proxy, _ in preferred_proxies:
-                    f.write(f"{proxy}\n")
+            with open(PREFERRED_PROXY_FILE, 'w', encoding='utf-8', buffering=1 << 20) as f:
+                f.write('\n'.join(proxy for _, _, proxy in preferred_proxies) + '\n')
             print(f"提取了 {len(preferred_proxies)} 个响应时间小于{PREFERRED_MAX_RESPONSE_TIME}ms的优选代理到 {PREFERRED_PROXY_FILE}")
         else:
             print(f"无响应时间小于{PREFERRED_MAX_RESPONSE_TIME}ms的优选代理。")
@@ -553,7 +701,7 @@ print("="*80)
 # 显示优选代理（响应时间小于设定阈值）
 if PREFERRED_PROXY_PORT and preferred_port_proxies:
     print(f"\n优选代理 (响应时间 < {PREFERRED_MAX_RESPONSE_TIME}ms 且端口为 {PREFERRED_PROXY_PORT}):")
-    for _, proxy in preferred_port_proxies:
+    for _, _, proxy in preferred_port_proxies:
         parts = proxy.split('#')
         if len(parts) >= 2:
             ip_port = parts[0]
@@ -564,7 +712,7 @@ if PREFERRED_PROXY_PORT and preferred_port_proxies:
         print(f"  ★ {display_proxy}")
 elif not PREFERRED_PROXY_PORT and preferred_proxies:
     print(f"\n优选代理 (响应时间 < {PREFERRED_MAX_RESPONSE_TIME}ms):")
-    for _, proxy, _ in preferred_proxies:
+    for _, _, proxy in preferred_proxies:
         parts = proxy.split('#')
         if len(parts) >= 2:
             ip_port = parts[0]
@@ -577,7 +725,7 @@ elif not PREFERRED_PROXY_PORT and preferred_proxies:
 # 显示所有成功代理
 if successful_proxies:
     print(f"\n所有成功代理 (共 {len(successful_proxies)} 个):")
-    for _, proxy in successful_proxies:
+    for _, _, proxy in successful_proxies:
         parts = proxy.split('#')
         if len(parts) >= 2:
             ip_port = parts[0]